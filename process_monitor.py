@@ -13,13 +13,42 @@ import signal
 import sys
 import argparse
 import threading
-from datetime import datetime
+import select
+from datetime import datetime, timedelta
 import logging
 from collections import defaultdict
 import glob
-import statistics
+import math
+import array
+import re
 import platform
 
+try:
+    import ijson  # Optional: incremental parsing of large monitor data files
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster JSON parsing of monitor data files
+except ImportError:
+    orjson = None
+
+# Data files at least this large are streamed with ijson instead of json.load
+STREAMING_LOAD_THRESHOLD = 1024 * 1024
+
+# Fields of /proc/loadavg and /proc/meminfo used by get_system_info, matched in one pass
+_LOADAVG_RE = re.compile(rb'([\d.]+) ([\d.]+) ([\d.]+)')
+# Each field is matched on its own: kernels before 3.14 have no MemAvailable line
+_MEMINFO_RE = re.compile(rb'^(MemTotal|MemFree|MemAvailable):\s+(\d+)', re.MULTILINE)
+_STATUS_THREADS_RE = re.compile(rb'^Threads:\s+(\d+)', re.MULTILINE)
+# Resident set size as ps reports it; the stat rss field is a lower approximate counter
+_STATUS_VMRSS_RE = re.compile(rb'^VmRSS:\s+(\d+)', re.MULTILINE)
+
+# One row of `ps -o pid,ppid,pcpu,pmem,rss,vsz,etime,comm,args`, matched in one pass
+_PS_ROW_RE = re.compile(r'\s*(\d+)\s+(\d+)\s+([\d.]+)\s+([\d.]+)\s+(\d+)\s+(\d+)\s+(\S+)\s+(\S+)(?:\s+(.*\S))?')
+_PS_ROW_FIELDS = ('pid', 'ppid', 'cpu_percent', 'memory_percent', 'rss_kb', 'vsz_kb', 'etime', 'comm', 'args')
+_PS_ROW_CONVERTERS = (int, int, float, float, int, int, str, str, str)
+
 # ANSI color codes for terminal output
 class Colors:
     """ANSI color codes for terminal output"""
@@ -58,6 +87,68 @@ class Colors:
     BG_CYAN = '\033[46m'
     BG_WHITE = '\033[47m'
 
+# Live table color bins: (lower bound, color), the first bound the value exceeds wins
+CPU_COLOR_BINS = ((50, Colors.RED), (20, Colors.BRIGHT_RED), (float('-inf'), Colors.GREEN))
+MEM_PERCENT_COLOR_BINS = ((50, Colors.GREEN), (20, Colors.BRIGHT_GREEN), (float('-inf'), Colors.GREEN))
+MEM_MB_COLOR_BINS = ((100, Colors.BLUE), (50, Colors.BRIGHT_BLUE), (float('-inf'), Colors.BLUE))
+FD_COLOR_BINS = ((float('-inf'), Colors.BRIGHT_YELLOW),)
+THREAD_COLOR_BINS = ((float('-inf'), Colors.BRIGHT_GREEN),)
+
+def bin_color(value, bins):
+    """Return the color of the first (lower bound, color) bin that value exceeds"""
+    for bound, color in bins:
+        if value > bound:
+            return color
+    return bins[-1][1]
+
+# Summary block of one target, filled once per target by print_summary
+SUMMARY_TARGET_TEMPLATE = "\n".join((
+    "",
+    f"{Colors.BOLD}{Colors.MAGENTA}🎯 监控目标: {{target}}{Colors.RESET}",
+    f"  {Colors.YELLOW}📋 PID:{Colors.RESET} {{pid}}",
+    f"  {Colors.BLUE}⚙️  命令:{Colors.RESET} {{command}}",
+    f"  {Colors.CYAN}⏱️  监控时长:{Colors.RESET} {{duration:.0f}} 秒",
+    f"  {Colors.GREEN}📊 数据样本:{Colors.RESET} {{samples}} 个",
+    f"  {Colors.RED}🖥️  CPU使用率:{Colors.RESET} {{cpu_color}}平均 {{avg_cpu:.2f}}%{Colors.RESET}, {Colors.RED}最大 {{max_cpu:.2f}}%{Colors.RESET}",
+    f"  {Colors.BLUE}💾 内存使用量:{Colors.RESET} {{mem_color}}平均 {{avg_memory_mb:.2f}} MB{Colors.RESET}, {Colors.BLUE}最大 {{max_memory_mb:.2f}} MB{Colors.RESET}",
+    f"  {Colors.GREEN}📈 内存使用率:{Colors.RESET} {{mem_pct_color}}平均 {{avg_memory_percent:.2f}}%{Colors.RESET}, {Colors.GREEN}最大 {{max_memory_percent:.2f}}%{Colors.RESET}",
+))
+
+# Consecutive all-missing ticks before the sampling interval starts backing off
+IDLE_BACKOFF_TICKS = 3
+
+# Charts with more samples than this are drawn as plain lines without per-sample markers
+CHART_MARKER_MAX_POINTS = 200
+
+# Chart resolution; series longer than 4 points per horizontal pixel are M4-downsampled
+CHART_DPI = 150
+
+# zlib level for saved PNG charts: 1 encodes several times faster than the default 6
+# at a modestly larger file
+CHART_PNG_COMPRESS_LEVEL = 1
+
+# Chart style per metric: (y-axis label, title suffix, line color, marker)
+CHART_METRIC_STYLES = {
+    'cpu_percent': ('CPU Usage (%)', 'CPU Usage', 'b', 'o'),
+    'memory_percent': ('Memory Usage (%)', 'Memory Usage %', 'r', 's'),
+    'memory_mb': ('Memory Usage (MB)', 'Memory Usage', 'g', '^'),
+    'fd_count': ('File Descriptors', 'File Descriptors', 'orange', 'D'),
+    'thread_count': ('Thread Count', 'Thread Count', 'gray', 'h'),
+}
+
+# Seconds a process name target keeps its resolved PID before it is looked up again
+PID_CACHE_TTL = 5.0
+
+# Optional live table columns:
+# (config key, default, data key, header, header color, value format, color bins, zero cell)
+LIVE_TABLE_COLUMNS = (
+    ('cpu_percent', True, 'cpu_percent', 'CPU%', Colors.RED, '<8.2f', CPU_COLOR_BINS, '0.00'),
+    ('memory_percent', True, 'memory_percent', '内存%', Colors.GREEN, '<8.2f', MEM_PERCENT_COLOR_BINS, '0.00'),
+    ('memory_mb', True, 'memory_mb', '内存MB', Colors.BLUE, '<8.2f', MEM_MB_COLOR_BINS, '0.00'),
+    ('file_descriptors', False, 'fd_count', '文件描述符', Colors.BRIGHT_YELLOW, '<8', FD_COLOR_BINS, '0'),
+    ('thread_count', False, 'thread_count', '线程数', Colors.BRIGHT_GREEN, '<8', THREAD_COLOR_BINS, '0'),
+)
+
 def colorize(text, color):
     """Apply color to text"""
     return f"{color}{text}{Colors.RESET}"
@@ -88,35 +179,226 @@ def print_info(message):
     """Print info message in blue"""
     print(f"{Colors.BLUE}ℹ {message}{Colors.RESET}")
 
+def print_lines(lines):
+    """Print lines with a single encode and write on the underlying binary stdout"""
+    text = '\n'.join(lines) + '\n'
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    # Flush pending text-layer output first so the order on the terminal is kept
+    sys.stdout.flush()
+    buffer.write(text.encode(sys.stdout.encoding or 'utf-8', 'replace'))
+    buffer.flush()
+
+def format_elapsed(seconds):
+    """Format elapsed seconds like ps etime: [[dd-]hh:]mm:ss"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    if days:
+        return f"{days}-{hours:02d}:{minutes:02d}:{secs:02d}"
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+def load_json_file(path):
+    """Parse a JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Per-sample metrics summarized by the performance report
+REPORT_METRICS = (
+    'cpu_percent', 'memory_percent', 'memory_mb',
+    'disk_read_bytes', 'disk_write_bytes',
+    'network_rx_bytes', 'network_tx_bytes',
+    'voluntary_switches', 'involuntary_switches',
+    'thread_count'
+)
+
+# Process-level fields the report reads from the first sample only
+REPORT_HEADER_FIELDS = ('timestamp', 'pid', 'command', 'args', 'rss_kb', 'vsz_kb')
+
+def stream_data_file_samples(f, fields=None):
+    """Stream (target, sample dict) pairs from an open monitor data file with ijson
+
+    Only one sample is held as Python objects at a time. With fields given,
+    samples keep only those keys. Targets without samples yield nothing.
+    """
+    depth = 0
+    target = key = sample = None
+    for event, value in ijson.basic_parse(f, use_float=True):
+        if event == 'map_key':
+            if depth == 1:
+                target = value
+            else:
+                key = value
+        elif event == 'start_map':
+            depth += 1
+            if depth == 2:
+                sample = {}
+        elif event == 'end_map':
+            depth -= 1
+            if depth == 1:
+                yield target, sample
+        elif depth == 2 and (fields is None or key in fields):
+            sample[key] = value
+
+def iter_report_samples(f):
+    """Stream (process_name, samples) from a monitor data file, keeping only report fields
+
+    Every sample keeps REPORT_METRICS; only the first keeps REPORT_HEADER_FIELDS
+    and only the last gets its timestamp, since the report reads no other fields.
+    """
+    metric_fields = frozenset(REPORT_METRICS)
+    header_fields = metric_fields.union(REPORT_HEADER_FIELDS)
+    process_name = None
+    samples = []
+    last_timestamp = None
+    for target, sample in stream_data_file_samples(f, header_fields):
+        if target != process_name:
+            if samples:
+                samples[-1]['timestamp'] = last_timestamp
+                yield process_name, samples
+            process_name = target
+            samples = []
+        last_timestamp = sample.get('timestamp', last_timestamp)
+        if samples:
+            sample = {key: value for key, value in sample.items() if key in metric_fields}
+        samples.append(sample)
+    if samples:
+        samples[-1]['timestamp'] = last_timestamp
+        yield process_name, samples
+
+def iter_data_file_samples(path):
+    """Yield (target, sample dict) pairs of a monitor data file, streaming large files with ijson"""
+    if ijson is None or os.path.getsize(path) < STREAMING_LOAD_THRESHOLD:
+        for target, samples in load_json_file(path).items():
+            for sample in samples:
+                yield target, sample
+        return
+    
+    with open(path, 'rb') as f:
+        yield from stream_data_file_samples(f)
+
+# Optional summary table columns: (report section, header cells, separator cells, section fields)
+# A section without fields holds its stats directly
+SUMMARY_OPTIONAL_COLUMNS = (
+    ('disk_io', " 磁盘读取(KB) | 磁盘写入(KB) |", "--------------|--------------|", ('read_bytes', 'write_bytes')),
+    ('network_io', " 网络接收(KB) | 网络发送(KB) |", "--------------|--------------|", ('rx_bytes', 'tx_bytes')),
+    ('context_switches', " 自愿切换 | 非自愿切换 |", "----------|----------|", ('voluntary', 'involuntary')),
+    ('thread_count', " 线程数 |", "--------|", ())
+)
+
+def m4_indices(x, y, bins):
+    """Return sorted indices of the first, last, min and max sample of each x bin (M4 downsampling)
+    
+    Drawing only these samples renders the same line as the full series when there
+    is one bin per horizontal pixel. x must be ascending.
+    """
+    import numpy as np
+    span = x[-1] - x[0]
+    if span <= 0:
+        return np.arange(len(y))
+    bin_ids = np.minimum(((x - x[0]) * bins // span).astype(np.int64), bins - 1)
+    starts = np.flatnonzero(np.r_[True, bin_ids[1:] != bin_ids[:-1]])
+    ends = np.r_[starts[1:], len(y)] - 1
+    # Sorting by (bin, value) puts each bin's min first and max last within its run
+    order = np.lexsort((y, bin_ids))
+    return np.unique(np.concatenate((starts, ends, order[starts], order[ends])))
+
+def column_mean_max(column):
+    """Return (mean, max) of a non-empty NumPy column as Python numbers"""
+    return column.mean().item(), column.max().item()
+
+def summarize_samples(samples, metrics=REPORT_METRICS, keep_values=False):
+    """Calculate avg/max/min/std of several metrics in a single pass over a list of samples
+
+    Returns:
+        (summary, active): per-metric stats dicts, and the set of metrics that
+        had at least one non-zero sample
+    """
+    count = len(samples)
+    # Metrics no sample carries (e.g. I/O counters the monitor never records) are all
+    # zeros; find them with one C-level key union instead of walking them per sample
+    present = set().union(*samples)
+    
+    # [key, mean, M2, min, max, values] per metric; Welford's algorithm keeps std single-pass
+    accumulators = [[key, 0.0, 0.0, math.inf, -math.inf, [] if keep_values else None]
+                    for key in metrics if key in present]
+    n = 0
+    for item in samples:
+        n += 1
+        for acc in accumulators:
+            value = item.get(acc[0], 0)
+            delta = value - acc[1]
+            acc[1] += delta / n
+            acc[2] += delta * (value - acc[1])
+            if value < acc[3]:
+                acc[3] = value
+            if value > acc[4]:
+                acc[4] = value
+            if keep_values:
+                acc[5].append(value)
+    
+    summary = {}
+    active = set()
+    for key in metrics:
+        if key not in present:
+            summary[key] = {'avg': 0, 'max': 0, 'min': 0, 'std': 0}
+            if keep_values:
+                summary[key]['data'] = [0] * count
+    for key, mean, m2, min_value, max_value, values in accumulators:
+        summary[key] = {
+            'avg': round(mean, 2),
+            'max': round(max_value, 2),
+            'min': round(min_value, 2),
+            'std': round(math.sqrt(m2 / (count - 1)) if count > 1 else 0, 2)
+        }
+        if keep_values:
+            summary[key]['data'] = values
+        # A series is all zeros exactly when both extremes are zero
+        if min_value or max_value:
+            active.add(key)
+    return summary, active
+
 
 class PerformanceReportTemplate:
+    # Platform details don't change during a run; filled on first use
+    _system_info_cache = None
+    
     def __init__(self, data_file=None, report_dir=None, command_params=None):
         self.data_file = data_file
         self.report_dir = report_dir
         self.data = None
+        self.streaming = False  # True when data is parsed lazily from data_file
         self.report_data = {}
         self.system_info = self.get_system_info()
         self.command_params = command_params or {}
         
     def get_system_info(self):
         """Get system information"""
-        try:
-            system = platform.system()
-            machine = platform.machine()
-            processor = platform.processor()
-            return {
-                'system': system,
-                'machine': machine,
-                'processor': processor,
-                'platform': platform.platform()
-            }
-        except Exception as e:
-            return {
-                'system': 'Unknown',
-                'machine': 'Unknown',
-                'processor': 'Unknown',
-                'platform': 'Unknown'
-            }
+        cls = type(self)
+        if cls._system_info_cache is None:
+            try:
+                cls._system_info_cache = {
+                    'system': platform.system(),
+                    'machine': platform.machine(),
+                    'processor': platform.processor(),
+                    'platform': platform.platform()
+                }
+            except Exception as e:
+                cls._system_info_cache = {
+                    'system': 'Unknown',
+                    'machine': 'Unknown',
+                    'processor': 'Unknown',
+                    'platform': 'Unknown'
+                }
+        return cls._system_info_cache
     
     def load_data(self, data_file=None):
         """Load monitoring data"""
@@ -127,293 +409,208 @@ class PerformanceReportTemplate:
             return False
             
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            if ijson is not None and os.path.getsize(self.data_file) >= STREAMING_LOAD_THRESHOLD:
+                # Large file: defer parsing to analyze_data, one process at a time
+                self.data = None
+                self.streaming = True
+            else:
+                self.data = load_json_file(self.data_file)
+                self.streaming = False
             print(f"✓ Successfully loaded data file: {self.data_file}")
             return True
         except Exception as e:
             print(f"✗ Failed to load data: {e}")
             return False
     
-    def analyze_data(self):
-        """Analyze monitoring data"""
-        if not self.data:
+    def iter_process_data(self):
+        """Iterate (process_name, process_data) pairs, streaming from data_file if needed"""
+        if not self.streaming:
+            yield from self.data.items()
+            return
+        
+        with open(self.data_file, 'rb') as f:
+            yield from iter_report_samples(f)
+    
+    def analyze_data(self, include_raw=False):
+        """Analyze monitoring data
+
+        Args:
+            include_raw: Keep the per-sample series under each metric's 'data' key
+                        (only needed when plotting from report_data)
+        """
+        if not self.data and not self.streaming:
             return False
         
         self.report_data = {}
         
-        for process_name, process_data in self.data.items():
-            if not process_data:
-                continue
-            
-            # Extract metrics
-            timestamps = [datetime.fromisoformat(item['timestamp']) for item in process_data]
-            
-            # Extract basic metrics (always available)
-            cpu_data = [item['cpu_percent'] for item in process_data]
-            memory_percent_data = [item['memory_percent'] for item in process_data]
-            memory_mb_data = [item['memory_mb'] for item in process_data]
-            
-            # Extract optional metrics if they exist
-            disk_read_data = [item.get('disk_read_bytes', 0) for item in process_data]
-            disk_write_data = [item.get('disk_write_bytes', 0) for item in process_data]
-            network_rx_data = [item.get('network_rx_bytes', 0) for item in process_data]
-            network_tx_data = [item.get('network_tx_bytes', 0) for item in process_data]
-            voluntary_switches_data = [item.get('voluntary_switches', 0) for item in process_data]
-            involuntary_switches_data = [item.get('involuntary_switches', 0) for item in process_data]
-            thread_count_data = [item.get('thread_count', 0) for item in process_data]
-            
-            # Calculate statistics
-            analysis = {
-                'process_name': process_name,
-                'pid': process_data[0]['pid'],
-                'command': process_data[0]['command'],
-                'args': process_data[0]['args'],
-                'data_points': len(process_data),
-                'test_duration': (timestamps[-1] - timestamps[0]).total_seconds(),
-                'start_time': timestamps[0],
-                'end_time': timestamps[-1],
-                'cpu': {
-                    'avg': round(statistics.mean(cpu_data), 2),
-                    'max': round(max(cpu_data), 2),
-                    'min': round(min(cpu_data), 2),
-                    'std': round(statistics.stdev(cpu_data) if len(cpu_data) > 1 else 0, 2),
-                    'data': cpu_data
-                },
-                'memory_percent': {
-                    'avg': round(statistics.mean(memory_percent_data), 2),
-                    'max': round(max(memory_percent_data), 2),
-                    'min': round(min(memory_percent_data), 2),
-                    'std': round(statistics.stdev(memory_percent_data) if len(memory_percent_data) > 1 else 0, 2),
-                    'data': memory_percent_data
-                },
-                'memory_mb': {
-                    'avg': round(statistics.mean(memory_mb_data), 2),
-                    'max': round(max(memory_mb_data), 2),
-                    'min': round(min(memory_mb_data), 2),
-                    'std': round(statistics.stdev(memory_mb_data) if len(memory_mb_data) > 1 else 0, 2),
-                    'data': memory_mb_data
-                },
-                'rss_kb': process_data[0]['rss_kb'],
-                'vsz_kb': process_data[0]['vsz_kb']
-            }
-            
-            # Add optional metrics if they have non-zero data
-            if any(disk_read_data) or any(disk_write_data):
-                analysis['disk_io'] = {
-                    'read_bytes': {
-                        'avg': round(statistics.mean(disk_read_data), 2),
-                        'max': round(max(disk_read_data), 2),
-                        'min': round(min(disk_read_data), 2),
-                        'std': round(statistics.stdev(disk_read_data) if len(disk_read_data) > 1 else 0, 2),
-                        'data': disk_read_data
-                    },
-                    'write_bytes': {
-                        'avg': round(statistics.mean(disk_write_data), 2),
-                        'max': round(max(disk_write_data), 2),
-                        'min': round(min(disk_write_data), 2),
-                        'std': round(statistics.stdev(disk_write_data) if len(disk_write_data) > 1 else 0, 2),
-                        'data': disk_write_data
-                    }
-                }
-            
-            if any(network_rx_data) or any(network_tx_data):
-                analysis['network_io'] = {
-                    'rx_bytes': {
-                        'avg': round(statistics.mean(network_rx_data), 2),
-                        'max': round(max(network_rx_data), 2),
-                        'min': round(min(network_rx_data), 2),
-                        'std': round(statistics.stdev(network_rx_data) if len(network_rx_data) > 1 else 0, 2),
-                        'data': network_rx_data
-                    },
-                    'tx_bytes': {
-                        'avg': round(statistics.mean(network_tx_data), 2),
-                        'max': round(max(network_tx_data), 2),
-                        'min': round(min(network_tx_data), 2),
-                        'std': round(statistics.stdev(network_tx_data) if len(network_tx_data) > 1 else 0, 2),
-                        'data': network_tx_data
-                    }
-                }
-            
-            if any(voluntary_switches_data) or any(involuntary_switches_data):
-                analysis['context_switches'] = {
-                    'voluntary': {
-                        'avg': round(statistics.mean(voluntary_switches_data), 2),
-                        'max': round(max(voluntary_switches_data), 2),
-                        'min': round(min(voluntary_switches_data), 2),
-                        'std': round(statistics.stdev(voluntary_switches_data) if len(voluntary_switches_data) > 1 else 0, 2),
-                        'data': voluntary_switches_data
-                    },
-                    'involuntary': {
-                        'avg': round(statistics.mean(involuntary_switches_data), 2),
-                        'max': round(max(involuntary_switches_data), 2),
-                        'min': round(min(involuntary_switches_data), 2),
-                        'std': round(statistics.stdev(involuntary_switches_data) if len(involuntary_switches_data) > 1 else 0, 2),
-                        'data': involuntary_switches_data
-                    }
-                }
-            
-            if any(thread_count_data):
-                analysis['thread_count'] = {
-                    'avg': round(statistics.mean(thread_count_data), 2),
-                    'max': round(max(thread_count_data), 2),
-                    'min': round(min(thread_count_data), 2),
-                    'std': round(statistics.stdev(thread_count_data) if len(thread_count_data) > 1 else 0, 2),
-                    'data': thread_count_data
-                }
-            
-            self.report_data[process_name] = analysis
+        # Processes are analyzed one after another: the pure-Python reductions hold
+        # the GIL, so a thread pool would add overhead without parallel speedup,
+        # and consuming the iterator lazily keeps streamed files one process deep
+        for process_name, process_data in self.iter_process_data():
+            if process_data:
+                self.report_data[process_name] = self.analyze_process(process_name, process_data, include_raw)
         
         print(f"✓ 数据分析完成，共分析 {len(self.report_data)} 个进程")
         return True
     
-    def generate_summary_table(self):
-        """Generate summary table"""
-        if not self.report_data:
-            return ""
+    def analyze_process(self, process_name, process_data, include_raw=False):
+        """Analyze the samples of a single process"""
+        # Process metadata and the test window come from the endpoints only
+        first = process_data[0]
+        start_time = datetime.fromisoformat(first['timestamp'])
+        end_time = datetime.fromisoformat(process_data[-1]['timestamp'])
+        
+        # Extract and summarize every metric in one pass
+        stats, active = summarize_samples(process_data, keep_values=include_raw)
         
-        # Determine which metrics are available
-        has_disk_io = any('disk_io' in data for data in self.report_data.values())
-        has_network_io = any('network_io' in data for data in self.report_data.values())
-        has_context_switches = any('context_switches' in data for data in self.report_data.values())
-        has_thread_count = any('thread_count' in data for data in self.report_data.values())
+        analysis = {
+            'process_name': process_name,
+            'pid': first['pid'],
+            'command': first['command'],
+            'args': first['args'],
+            'data_points': len(process_data),
+            'test_duration': (end_time - start_time).total_seconds(),
+            'start_time': start_time,
+            'end_time': end_time,
+            'cpu': stats['cpu_percent'],
+            'memory_percent': stats['memory_percent'],
+            'memory_mb': stats['memory_mb'],
+            'rss_kb': first['rss_kb'],
+            'vsz_kb': first['vsz_kb']
+        }
+        
+        # Add optional metrics if they have non-zero data
+        if 'disk_read_bytes' in active or 'disk_write_bytes' in active:
+            analysis['disk_io'] = {
+                'read_bytes': stats['disk_read_bytes'],
+                'write_bytes': stats['disk_write_bytes']
+            }
+        
+        if 'network_rx_bytes' in active or 'network_tx_bytes' in active:
+            analysis['network_io'] = {
+                'rx_bytes': stats['network_rx_bytes'],
+                'tx_bytes': stats['network_tx_bytes']
+            }
         
-        table = "## 性能指标汇总表\n\n"
+        if 'voluntary_switches' in active or 'involuntary_switches' in active:
+            analysis['context_switches'] = {
+                'voluntary': stats['voluntary_switches'],
+                'involuntary': stats['involuntary_switches']
+            }
         
-        # Build table header
-        header = "| 进程名称 | PID | CPU使用率(%) | 内存使用率(%) | 内存使用量(MB) |"
-        if has_disk_io:
-            header += " 磁盘读取(KB) | 磁盘写入(KB) |"
-        if has_network_io:
-            header += " 网络接收(KB) | 网络发送(KB) |"
-        if has_context_switches:
-            header += " 自愿切换 | 非自愿切换 |"
-        if has_thread_count:
-            header += " 线程数 |"
-        header += " 测试时长(秒) |"
+        if 'thread_count' in active:
+            analysis['thread_count'] = stats['thread_count']
         
-        table += header + "\n"
+        return analysis
+    
+    def generate_summary_table(self, out):
+        """Write summary table to a text stream"""
+        if not self.report_data:
+            return
         
-        # Build separator row
-        separator = "|----------|-----|--------------|---------------|----------------|"
-        if has_disk_io:
-            separator += "--------------|--------------|"
-        if has_network_io:
-            separator += "--------------|--------------|"
-        if has_context_switches:
-            separator += "----------|----------|"
-        if has_thread_count:
-            separator += "--------|"
-        separator += "--------------|"
+        # Determine which optional metrics are available
+        columns = [column for column in SUMMARY_OPTIONAL_COLUMNS
+                   if any(column[0] in data for data in self.report_data.values())]
         
-        table += separator + "\n"
+        # Build table header and separator row
+        header = ("| 进程名称 | PID | CPU使用率(%) | 内存使用率(%) | 内存使用量(MB) |"
+                  + "".join(column[1] for column in columns) + " 测试时长(秒) |")
+        separator = ("|----------|-----|--------------|---------------|----------------|"
+                     + "".join(column[2] for column in columns) + "--------------|")
+        
+        # Specialize the optional cell formatters once for this report's columns
+        def make_cells_formatter(section, fields):
+            zero_cells = " 0 |" * max(len(fields), 1)
+            def format_cells(data):
+                values = data.get(section)
+                if values is None:
+                    return zero_cells
+                if not fields:
+                    return f" {values['avg']:.0f} |"
+                return "".join(f" {values[field]['avg']:.0f} |" for field in fields)
+            return format_cells
+        
+        formatters = [make_cells_formatter(section, fields) for section, _, _, fields in columns]
+        
+        out.write(f"## 性能指标汇总表\n\n{header}\n{separator}\n")
         
         # Build data rows
         for process_name, data in self.report_data.items():
-            row = f"| {process_name} | {data['pid']} | {data['cpu']['avg']} | {data['memory_percent']['avg']} | {data['memory_mb']['avg']} |"
-            
-            if has_disk_io:
-                if 'disk_io' in data:
-                    row += f" {data['disk_io']['read_bytes']['avg']:.0f} | {data['disk_io']['write_bytes']['avg']:.0f} |"
-                else:
-                    row += " 0 | 0 |"
-            
-            if has_network_io:
-                if 'network_io' in data:
-                    row += f" {data['network_io']['rx_bytes']['avg']:.0f} | {data['network_io']['tx_bytes']['avg']:.0f} |"
-                else:
-                    row += " 0 | 0 |"
-            
-            if has_context_switches:
-                if 'context_switches' in data:
-                    row += f" {data['context_switches']['voluntary']['avg']:.0f} | {data['context_switches']['involuntary']['avg']:.0f} |"
-                else:
-                    row += " 0 | 0 |"
-            
-            if has_thread_count:
-                if 'thread_count' in data:
-                    row += f" {data['thread_count']['avg']:.0f} |"
-                else:
-                    row += " 0 |"
-            
-            row += f" {data['test_duration']:.0f} |"
-            table += row + "\n"
-        
-        return table
+            optional_cells = "".join(format_cells(data) for format_cells in formatters)
+            out.write(f"| {process_name} | {data['pid']} | {data['cpu']['avg']} | {data['memory_percent']['avg']} | {data['memory_mb']['avg']} |"
+                      f"{optional_cells} {data['test_duration']:.0f} |\n")
     
-    def generate_detailed_analysis(self):
-        """Generate detailed analysis"""
+    def generate_detailed_analysis(self, out):
+        """Write detailed analysis to a text stream"""
         if not self.report_data:
-            return ""
+            return
         
-        analysis = "## 详细性能分析\n\n"
+        out.write("## 详细性能分析\n\n")
         
         for process_name, data in self.report_data.items():
-            analysis += f"### {process_name} 详细分析\n\n"
-            analysis += f"**基本信息**\n\n"
-            analysis += f"- 进程ID: {data['pid']}\n"
-            analysis += f"- 进程名称: {data['process_name']}\n"
-            analysis += f"- 启动参数: `{data['args']}`\n"
-            analysis += f"- 虚拟内存: {data['vsz_kb']:,} KB ({data['vsz_kb']/1024:.1f} MB)\n"
-            analysis += f"- 物理内存: {data['rss_kb']:,} KB ({data['rss_kb']/1024:.1f} MB)\n"
-            analysis += f"- 测试时长: {data['test_duration']:.0f} 秒\n"
-            analysis += f"- 数据样本: {data['data_points']} 个\n\n"
-            
-            analysis += f"**性能指标**\n\n"
-            analysis += f"| 指标 | 平均值 | 最大值 | 最小值 | 标准差 |\n"
-            analysis += f"|------|--------|--------|--------|--------|\n"
-            analysis += f"| CPU使用率 (%) | {data['cpu']['avg']} | {data['cpu']['max']} | {data['cpu']['min']} | {data['cpu']['std']} |\n"
-            analysis += f"| 内存使用率 (%) | {data['memory_percent']['avg']} | {data['memory_percent']['max']} | {data['memory_percent']['min']} | {data['memory_percent']['std']} |\n"
-            analysis += f"| 内存使用量 (MB) | {data['memory_mb']['avg']} | {data['memory_mb']['max']} | {data['memory_mb']['min']} | {data['memory_mb']['std']} |\n"
+            out.write(f"### {process_name} 详细分析\n\n")
+            out.write(f"**基本信息**\n\n")
+            out.write(f"- 进程ID: {data['pid']}\n")
+            out.write(f"- 进程名称: {data['process_name']}\n")
+            out.write(f"- 启动参数: `{data['args']}`\n")
+            out.write(f"- 虚拟内存: {data['vsz_kb']:,} KB ({data['vsz_kb']/1024:.1f} MB)\n")
+            out.write(f"- 物理内存: {data['rss_kb']:,} KB ({data['rss_kb']/1024:.1f} MB)\n")
+            out.write(f"- 测试时长: {data['test_duration']:.0f} 秒\n")
+            out.write(f"- 数据样本: {data['data_points']} 个\n\n")
+            
+            out.write(f"**性能指标**\n\n")
+            out.write(f"| 指标 | 平均值 | 最大值 | 最小值 | 标准差 |\n")
+            out.write(f"|------|--------|--------|--------|--------|\n")
+            out.write(f"| CPU使用率 (%) | {data['cpu']['avg']} | {data['cpu']['max']} | {data['cpu']['min']} | {data['cpu']['std']} |\n")
+            out.write(f"| 内存使用率 (%) | {data['memory_percent']['avg']} | {data['memory_percent']['max']} | {data['memory_percent']['min']} | {data['memory_percent']['std']} |\n")
+            out.write(f"| 内存使用量 (MB) | {data['memory_mb']['avg']} | {data['memory_mb']['max']} | {data['memory_mb']['min']} | {data['memory_mb']['std']} |\n")
             
             # Add optional metrics if they exist
             if 'disk_io' in data:
-                analysis += f"| 磁盘读取 (字节) | {data['disk_io']['read_bytes']['avg']:.0f} | {data['disk_io']['read_bytes']['max']:.0f} | {data['disk_io']['read_bytes']['min']:.0f} | {data['disk_io']['read_bytes']['std']:.0f} |\n"
-                analysis += f"| 磁盘写入 (字节) | {data['disk_io']['write_bytes']['avg']:.0f} | {data['disk_io']['write_bytes']['max']:.0f} | {data['disk_io']['write_bytes']['min']:.0f} | {data['disk_io']['write_bytes']['std']:.0f} |\n"
+                out.write(f"| 磁盘读取 (字节) | {data['disk_io']['read_bytes']['avg']:.0f} | {data['disk_io']['read_bytes']['max']:.0f} | {data['disk_io']['read_bytes']['min']:.0f} | {data['disk_io']['read_bytes']['std']:.0f} |\n")
+                out.write(f"| 磁盘写入 (字节) | {data['disk_io']['write_bytes']['avg']:.0f} | {data['disk_io']['write_bytes']['max']:.0f} | {data['disk_io']['write_bytes']['min']:.0f} | {data['disk_io']['write_bytes']['std']:.0f} |\n")
             
             if 'network_io' in data:
-                analysis += f"| 网络接收 (字节) | {data['network_io']['rx_bytes']['avg']:.0f} | {data['network_io']['rx_bytes']['max']:.0f} | {data['network_io']['rx_bytes']['min']:.0f} | {data['network_io']['rx_bytes']['std']:.0f} |\n"
-                analysis += f"| 网络发送 (字节) | {data['network_io']['tx_bytes']['avg']:.0f} | {data['network_io']['tx_bytes']['max']:.0f} | {data['network_io']['tx_bytes']['min']:.0f} | {data['network_io']['tx_bytes']['std']:.0f} |\n"
+                out.write(f"| 网络接收 (字节) | {data['network_io']['rx_bytes']['avg']:.0f} | {data['network_io']['rx_bytes']['max']:.0f} | {data['network_io']['rx_bytes']['min']:.0f} | {data['network_io']['rx_bytes']['std']:.0f} |\n")
+                out.write(f"| 网络发送 (字节) | {data['network_io']['tx_bytes']['avg']:.0f} | {data['network_io']['tx_bytes']['max']:.0f} | {data['network_io']['tx_bytes']['min']:.0f} | {data['network_io']['tx_bytes']['std']:.0f} |\n")
             
             if 'context_switches' in data:
-                analysis += f"| 自愿上下文切换 | {data['context_switches']['voluntary']['avg']:.0f} | {data['context_switches']['voluntary']['max']:.0f} | {data['context_switches']['voluntary']['min']:.0f} | {data['context_switches']['voluntary']['std']:.0f} |\n"
-                analysis += f"| 非自愿上下文切换 | {data['context_switches']['involuntary']['avg']:.0f} | {data['context_switches']['involuntary']['max']:.0f} | {data['context_switches']['involuntary']['min']:.0f} | {data['context_switches']['involuntary']['std']:.0f} |\n"
+                out.write(f"| 自愿上下文切换 | {data['context_switches']['voluntary']['avg']:.0f} | {data['context_switches']['voluntary']['max']:.0f} | {data['context_switches']['voluntary']['min']:.0f} | {data['context_switches']['voluntary']['std']:.0f} |\n")
+                out.write(f"| 非自愿上下文切换 | {data['context_switches']['involuntary']['avg']:.0f} | {data['context_switches']['involuntary']['max']:.0f} | {data['context_switches']['involuntary']['min']:.0f} | {data['context_switches']['involuntary']['std']:.0f} |\n")
             
             if 'thread_count' in data:
-                analysis += f"| 线程数 | {data['thread_count']['avg']:.0f} | {data['thread_count']['max']:.0f} | {data['thread_count']['min']:.0f} | {data['thread_count']['std']:.0f} |\n"
+                out.write(f"| 线程数 | {data['thread_count']['avg']:.0f} | {data['thread_count']['max']:.0f} | {data['thread_count']['min']:.0f} | {data['thread_count']['std']:.0f} |\n")
             
-            analysis += "\n"
+            out.write("\n")
             
             # Performance evaluation
-            analysis += f"**性能评估**\n\n"
+            out.write(f"**性能评估**\n\n")
             
             # CPU evaluation
             if data['cpu']['avg'] < 1.0:
-                analysis += f"- ✅ **CPU性能优秀**: 平均CPU使用率 {data['cpu']['avg']}%，对系统性能影响极小\n"
+                out.write(f"- ✅ **CPU性能优秀**: 平均CPU使用率 {data['cpu']['avg']}%，对系统性能影响极小\n")
             elif data['cpu']['avg'] < 5.0:
-                analysis += f"- ✅ **CPU性能良好**: 平均CPU使用率 {data['cpu']['avg']}%，CPU占用适中\n"
+                out.write(f"- ✅ **CPU性能良好**: 平均CPU使用率 {data['cpu']['avg']}%，CPU占用适中\n")
             else:
-                analysis += f"- ⚠️ **CPU性能需关注**: 平均CPU使用率 {data['cpu']['avg']}%，CPU占用较高\n"
+                out.write(f"- ⚠️ **CPU性能需关注**: 平均CPU使用率 {data['cpu']['avg']}%，CPU占用较高\n")
             
             # Memory evaluation
             if data['memory_mb']['avg'] < 50:
-                analysis += f"- ✅ **内存使用合理**: 平均内存使用量 {data['memory_mb']['avg']} MB，内存占用适中\n"
+                out.write(f"- ✅ **内存使用合理**: 平均内存使用量 {data['memory_mb']['avg']} MB，内存占用适中\n")
             elif data['memory_mb']['avg'] < 200:
-                analysis += f"- ✅ **内存使用可接受**: 平均内存使用量 {data['memory_mb']['avg']} MB，内存占用较高但可接受\n"
+                out.write(f"- ✅ **内存使用可接受**: 平均内存使用量 {data['memory_mb']['avg']} MB，内存占用较高但可接受\n")
             else:
-                analysis += f"- ⚠️ **内存使用需关注**: 平均内存使用量 {data['memory_mb']['avg']} MB，内存占用较高\n"
+                out.write(f"- ⚠️ **内存使用需关注**: 平均内存使用量 {data['memory_mb']['avg']} MB，内存占用较高\n")
             
             # Stability evaluation
             if data['cpu']['std'] == 0 and data['memory_mb']['std'] == 0:
-                analysis += f"- ✅ **运行稳定**: 所有指标在测试期间保持完全稳定，无波动\n"
+                out.write(f"- ✅ **运行稳定**: 所有指标在测试期间保持完全稳定，无波动\n")
             elif data['cpu']['std'] < 0.1 and data['memory_mb']['std'] < 1.0:
-                analysis += f"- ✅ **运行稳定**: 指标波动很小，运行稳定\n"
+                out.write(f"- ✅ **运行稳定**: 指标波动很小，运行稳定\n")
             else:
-                analysis += f"- ⚠️ **运行波动**: 指标存在一定波动，需要关注\n"
+                out.write(f"- ⚠️ **运行波动**: 指标存在一定波动，需要关注\n")
             
-            analysis += "\n"
-        
-        return analysis
+            out.write("\n")
     
     def get_test_target_description(self):
         """Get test target description from command parameters"""
@@ -442,37 +639,35 @@ class PerformanceReportTemplate:
         version = self.command_params.get('version', 'v1.0')
         return f"进程监控系统 monitor {version}"
     
-    def generate_conclusions(self):
-        """Generate conclusions and recommendations"""
+    def generate_conclusions(self, out):
+        """Write conclusions and recommendations to a text stream"""
         if not self.report_data:
-            return ""
+            return
         
-        conclusions = "## 测试结论与建议\n\n"
+        out.write("## 测试结论与建议\n\n")
         
         # Key findings
-        conclusions += "### 关键发现\n\n"
+        out.write("### 关键发现\n\n")
         
         for process_name, data in self.report_data.items():
-            conclusions += f"#### {process_name}\n\n"
+            out.write(f"#### {process_name}\n\n")
             
             if data['cpu']['avg'] < 1.0:
-                conclusions += f"- ✅ **CPU效率优秀**: {data['cpu']['avg']}%的CPU使用率表明对系统性能影响极小\n"
+                out.write(f"- ✅ **CPU效率优秀**: {data['cpu']['avg']}%的CPU使用率表明对系统性能影响极小\n")
             else:
-                conclusions += f"- ⚠️ **CPU使用需关注**: {data['cpu']['avg']}%的CPU使用率需要关注\n"
+                out.write(f"- ⚠️ **CPU使用需关注**: {data['cpu']['avg']}%的CPU使用率需要关注\n")
             
             if data['memory_mb']['avg'] < 50:
-                conclusions += f"- ✅ **内存使用合理**: {data['memory_mb']['avg']} MB的内存使用量在可接受范围内\n"
+                out.write(f"- ✅ **内存使用合理**: {data['memory_mb']['avg']} MB的内存使用量在可接受范围内\n")
             else:
-                conclusions += f"- ⚠️ **内存使用需关注**: {data['memory_mb']['avg']} MB的内存使用量需要关注\n"
+                out.write(f"- ⚠️ **内存使用需关注**: {data['memory_mb']['avg']} MB的内存使用量需要关注\n")
             
             if data['cpu']['std'] == 0 and data['memory_mb']['std'] == 0:
-                conclusions += f"- ✅ **运行稳定**: 测试期间所有指标保持完全稳定\n"
+                out.write(f"- ✅ **运行稳定**: 测试期间所有指标保持完全稳定\n")
             else:
-                conclusions += f"- ⚠️ **存在波动**: 测试期间指标存在一定波动\n"
+                out.write(f"- ⚠️ **存在波动**: 测试期间指标存在一定波动\n")
             
-            conclusions += "\n"
-        
-        return conclusions
+            out.write("\n")
     
     def generate_report(self, output_file=None):
         """Generate complete report"""
@@ -496,7 +691,7 @@ class PerformanceReportTemplate:
         monitoring_duration = self.get_monitoring_duration()
         test_tool = self.get_test_tool_version()
         
-        report = f"""# 性能测试报告
+        report_header = f"""# 性能测试报告
 
 ## 报告概述
 
@@ -524,9 +719,24 @@ class PerformanceReportTemplate:
 
 ## 测试结果
 
-{self.generate_summary_table()}
-{self.generate_detailed_analysis()}
-{self.generate_conclusions()}
+"""
+        
+        if not output_file:
+            if self.report_dir:
+                output_file = os.path.join(self.report_dir, "performance_report.md")
+            else:
+                output_file = f"performance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        
+        # Stream each section straight into the report file
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(report_header)
+                self.generate_summary_table(f)
+                f.write("\n")
+                self.generate_detailed_analysis(f)
+                f.write("\n")
+                self.generate_conclusions(f)
+                f.write(f"""
 ## 附录
 
 ### 测试数据文件
@@ -541,25 +751,13 @@ class PerformanceReportTemplate:
 **报告版本**: v1.0  
 **测试工程师**: AI Assistant  
 **审核状态**: 待审核
-"""
-        
-        # Save report
-        if not output_file:
-            if self.report_dir:
-                output_file = os.path.join(self.report_dir, "performance_report.md")
-            else:
-                output_file = f"performance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-        
-        try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(report)
+""")
             print(f"✓ 性能测试报告已生成: {output_file}")
             return True
         except Exception as e:
             print(f"✗ 保存报告失败: {e}")
             return False
 
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -570,6 +768,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Typed columns of a monitoring sample: (field, array typecode)
+SAMPLE_NUMERIC_FIELDS = (
+    ('pid', 'q'),
+    ('cpu_percent', 'd'),
+    ('memory_percent', 'd'),
+    ('memory_mb', 'd'),
+    ('rss_kb', 'q'),
+    ('vsz_kb', 'q'),
+    ('system_load', 'd'),
+    ('system_mem_available_mb', 'd'),
+)
+SAMPLE_OPTIONAL_FIELDS = (('fd_count', 'q'), ('thread_count', 'q'))
+SAMPLE_TEXT_FIELDS = ('target', 'target_name', 'command', 'args')
+_TIMESTAMP_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+class SampleSeries:
+    """Samples of one monitoring target stored column-wise in typed arrays
+    
+    Behaves like the list of sample dicts it replaces: len(), indexing and
+    iteration yield dicts, while column() gives direct access to a field.
+    Which optional metrics exist is decided by the first appended sample.
+    """
+    
+    def __init__(self):
+        self._timestamps = array.array('q')  # Microseconds since 1970-01-01, naive local time
+        self._numeric = {name: array.array(code) for name, code in SAMPLE_NUMERIC_FIELDS}
+        self._optional = None
+        # Text fields rarely change between samples, so equal values share one str object
+        self._text = {name: [] for name in SAMPLE_TEXT_FIELDS}
+    
+    def append(self, sample):
+        """Append one sample dict"""
+        if self._optional is None:
+            self._optional = {name: array.array(code)
+                              for name, code in SAMPLE_OPTIONAL_FIELDS if name in sample}
+        self._timestamps.append((sample['timestamp'] - _TIMESTAMP_EPOCH) // _ONE_MICROSECOND)
+        for name, column in self._numeric.items():
+            column.append(sample[name])
+        for name, column in self._optional.items():
+            column.append(sample.get(name, 0))
+        for name, column in self._text.items():
+            value = sample[name]
+            if column and column[-1] == value:
+                value = column[-1]
+            column.append(value)
+    
+    def __len__(self):
+        return len(self._timestamps)
+    
+    def __getitem__(self, index):
+        return {
+            'timestamp': _TIMESTAMP_EPOCH + timedelta(microseconds=self._timestamps[index]),
+            **{name: column[index] for name, column in self._text.items()},
+            **{name: column[index] for name, column in self._numeric.items()},
+            **{name: column[index] for name, column in (self._optional or {}).items()},
+        }
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+    
+    def column(self, name):
+        """Return all values of one field, timestamps as datetime objects"""
+        if name == 'timestamp':
+            return [_TIMESTAMP_EPOCH + timedelta(microseconds=value) for value in self._timestamps]
+        for columns in (self._numeric, self._optional or {}, self._text):
+            if name in columns:
+                return columns[name]
+        raise KeyError(name)
+    
+    def timestamp_micros(self):
+        """Return the raw timestamp column: microseconds since 1970-01-01, naive local time"""
+        return self._timestamps
+    
+    def duration(self):
+        """Return seconds between the first and last sample"""
+        if not self._timestamps:
+            return 0.0
+        return (self._timestamps[-1] - self._timestamps[0]) / 1e6
+
 class ProcessMonitor:
     def __init__(self, targets=None, monitor_config=None):
         """
@@ -583,9 +862,26 @@ class ProcessMonitor:
         self.targets = targets or []
         self.monitoring = False
         self.monitor_thread = None
-        self.data = defaultdict(list)  # Store data grouped by target identifier
+        self._stop_event = threading.Event()  # Set once the sampling loop should end or has ended
+        self.data = defaultdict(SampleSeries)  # Store data grouped by target identifier
         self.data_lock = threading.Lock()
         self.report_dir = None  # Report directory for this monitoring session
+        self._system = platform.system()
+        self._is_darwin = self._system == "Darwin"
+        self._mem_total_kb = None  # MemTotal from /proc/meminfo, read once
+        self._proc_fd_cache = {}  # pid -> {file name: fd} of open /proc/<pid> files
+        self._proc_fd_lock = threading.Lock()  # Guards _proc_fd_cache between the sampling and stopping threads
+        self._pool = None  # Collector threads for multiple targets on macOS, alive while monitoring
+        self._target_pid_cache = {}  # Process name target -> (PID, monotonic time resolved)
+        self._column_cache = {}  # Target -> ((series id, length, metrics), timestamps, columns)
+        self._figure_cache = {}  # (chart rows, chart columns) -> (figure, axes) kept for re-renders
+        self._exit_poller = None  # epoll over target pidfds while monitoring on Linux
+        self._exit_pidfds = {}  # PID -> (pidfd registered with _exit_poller, process start ticks)
+        self._exited_starts = {}  # PID -> start ticks of its process whose pidfd fired
+        self._exit_wake_pipe = None  # (read fd, write fd) registered with _exit_poller to interrupt a poll
+        self._exit_watch_lock = threading.Lock()
+        self._libproc = None  # ctypes handle to libproc on macOS, False if unavailable
+        self._mach_vm = None  # (libSystem, host port, vm_statistics64 struct) on macOS
         
         # Default monitoring configuration
         self.default_config = {
@@ -600,6 +896,29 @@ class ProcessMonitor:
         self.monitor_config = self.default_config.copy()
         if monitor_config:
             self.monitor_config.update(monitor_config)
+        
+        self.build_display_templates()
+    
+    def build_display_templates(self):
+        """Build the live table header and row templates for the enabled metrics"""
+        columns = [column for column in LIVE_TABLE_COLUMNS
+                   if self.monitor_config.get(column[0], column[1])]
+        
+        header = f"{Colors.BOLD}{Colors.CYAN}{'时间':<20}{Colors.RESET} {Colors.BOLD}{Colors.MAGENTA}{'进程名':<15}{Colors.RESET} {Colors.BOLD}{Colors.YELLOW}{'PID':<8}{Colors.RESET}"
+        for _, _, _, label, color, _, _, _ in columns:
+            header += f" {Colors.BOLD}{color}{label:<8}{Colors.RESET}"
+        self._display_header = header
+        
+        # (data key, color bins) of each metric cell, in display order
+        self._display_columns = [(data_key, bins) for _, _, data_key, _, _, _, bins, _ in columns]
+        # Arguments: name color, name, PID color, PID, then color and value per metric
+        self._row_template = f" {{}}{{:<15}}{Colors.RESET} {{}}{{:<8}}{Colors.RESET}" + ''.join(
+            f" {{}}{{:{fmt}}}{Colors.RESET}" for _, _, _, _, _, fmt, _, _ in columns)
+        # Targets are fixed, so their all-zero rows are complete strings
+        zero_cells = f" {Colors.DIM}{'0':<8}{Colors.RESET}" + ''.join(
+            f" {Colors.DIM}{zero:<8}{Colors.RESET}" for _, _, _, _, _, _, _, zero in columns)
+        self._zero_rows = {target: f" {Colors.DIM}{target:<15}{Colors.RESET}{zero_cells}"
+                           for target in self.targets}
     
     def create_report_directory(self):
         """Create a unique report directory with sequence number and timestamp"""
@@ -607,20 +926,27 @@ class ProcessMonitor:
             # Ensure report directory exists
             os.makedirs('report', exist_ok=True)
             
-            # Get next sequence number
-            existing_dirs = glob.glob('report/[0-9][0-9][0-9]_*')
-            if existing_dirs:
-                # Extract sequence numbers and find the highest
+            # Get next sequence number from the counter file
+            seq_file = os.path.join('report', '.seq')
+            try:
+                with open(seq_file, 'r') as f:
+                    next_seq = int(f.read()) + 1
+            except (OSError, ValueError):
+                # No usable counter yet: recover it from existing directory names once
                 seq_numbers = []
-                for dir_path in existing_dirs:
+                for dir_path in glob.glob('report/[0-9][0-9][0-9]_*'):
                     try:
                         seq_num = int(os.path.basename(dir_path).split('_')[0])
                         seq_numbers.append(seq_num)
                     except (ValueError, IndexError):
                         continue
                 next_seq = max(seq_numbers) + 1 if seq_numbers else 1
-            else:
-                next_seq = 1
+            
+            # Replace the counter atomically so a crash never leaves it truncated
+            tmp_seq_file = f"{seq_file}.{os.getpid()}.tmp"
+            with open(tmp_seq_file, 'w') as f:
+                f.write(str(next_seq))
+            os.replace(tmp_seq_file, seq_file)
             
             # Create directory with sequence number and timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -642,14 +968,16 @@ class ProcessMonitor:
     
     def is_pid(self, target):
         """Check if target is a PID"""
-        try:
-            int(target)
+        # PIDs are non-negative integers; isdecimal() accepts exactly the digits int() parses
+        if isinstance(target, int):
             return True
-        except ValueError:
-            return False
+        return isinstance(target, str) and target.isdecimal()
     
     def find_process_by_name(self, process_name):
         """Find process PID by process name, matching only executable files"""
+        if not self._is_darwin:  # Linux
+            return self.find_process_in_proc(process_name)
+        
         try:
             # First try to find exact executable name match
             result = subprocess.run(['pgrep', '-x', process_name], 
@@ -681,19 +1009,62 @@ class ProcessMonitor:
         except subprocess.TimeoutExpired:
             logger.warning(f"pgrep command timeout (process: {process_name})")
             return []
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Failed to find process PID (process: {process_name}): {e}")
             return []
     
+    def find_process_in_proc(self, process_name):
+        """Find process PIDs by executable name with a single /proc scan (Linux)"""
+        exact_pids = []
+        fallback_pids = []
+        lowered_name = process_name.lower()
+        try:
+            with os.scandir('/proc') as entries:
+                for entry in entries:
+                    if not entry.name.isdigit():
+                        continue
+                    try:
+                        with open(f'{entry.path}/comm', 'r') as f:
+                            comm = f.read().strip()
+                    except OSError:
+                        continue  # Process exited during the scan
+                    
+                    if comm == process_name:
+                        exact_pids.append(int(entry.name))
+                    elif comm.lower() == lowered_name:
+                        # Same as the pgrep -f '^name' fallback: command line must start with the name
+                        try:
+                            with open(f'{entry.path}/cmdline', 'rb') as f:
+                                cmdline = f.read().replace(b'\0', b' ').decode('utf-8', 'replace')
+                        except OSError:
+                            continue
+                        if cmdline.startswith(process_name):
+                            fallback_pids.append(int(entry.name))
+        except OSError as e:
+            logger.error(f"Failed to find process PID (process: {process_name}): {e}")
+            return []
+        
+        return sorted(exact_pids) if exact_pids else sorted(fallback_pids)
+    
     def verify_process_executable(self, pid, process_name):
         """Verify that the process with given PID actually has the expected executable name"""
         try:
-            # Get process command line
-            cmd = ['ps', '-p', str(pid), '-o', 'comm=']
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
-            
-            if result.returncode == 0 and result.stdout.strip():
+            if self._is_darwin:  # macOS
+                # Get process command line
+                cmd = ['ps', '-p', str(pid), '-o', 'comm=']
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=3)
+                if result.returncode != 0:
+                    return False
                 comm = result.stdout.strip()
+            else:  # Linux
+                # Read the executable name directly instead of forking ps
+                try:
+                    with open(f'/proc/{pid}/comm', 'r') as f:
+                        comm = f.read().strip()
+                except OSError:
+                    return False
+            
+            if comm:
                 # Check if the command name matches (case-insensitive)
                 if comm.lower() == process_name.lower():
                     return True
@@ -703,12 +1074,21 @@ class ProcessMonitor:
                     return True
             
             return False
-        except Exception as e:
+        except (OSError, subprocess.SubprocessError) as e:
             logger.debug(f"Failed to verify process executable for PID {pid}: {e}")
             return False
     
     def get_process_info(self, pid):
         """Get detailed process information"""
+        if not self._is_darwin:  # Linux
+            process_info = self.read_proc_process_info(pid)
+            if process_info:
+                # 在日志中输出完整的进程命令
+                logger.debug("监控进程 PID %s: %s", pid, process_info['args'])
+            else:
+                logger.debug("进程 PID %s 不存在或已结束", pid)
+            return process_info
+        
         try:
             cmd = ['ps', '-p', str(pid), '-o', 'pid,ppid,pcpu,pmem,rss,vsz,etime,comm,args']
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
@@ -716,49 +1096,193 @@ class ProcessMonitor:
             if result.returncode == 0 and result.stdout.strip():
                 lines = result.stdout.strip().split('\n')
                 if len(lines) >= 2:  # 跳过标题行
-                    parts = lines[1].split()
-                    if len(parts) >= 8:
-                        # 获取完整的命令行参数
-                        full_args = ' '.join(parts[8:]) if len(parts) > 8 else parts[7]
-                        
-                        process_info = {
-                            'pid': int(parts[0]),
-                            'ppid': int(parts[1]),
-                            'cpu_percent': float(parts[2]),
-                            'memory_percent': float(parts[3]),
-                            'rss_kb': int(parts[4]),
-                            'vsz_kb': int(parts[5]),
-                            'etime': parts[6],
-                            'comm': parts[7],
-                            'args': full_args
-                        }
+                    match = _PS_ROW_RE.match(lines[1])
+                    if match:
+                        values = list(match.groups())
+                        # 获取完整的命令行参数，没有参数时使用命令名
+                        if values[8] is None:
+                            values[8] = values[7]
+                        process_info = {field: convert(value) for field, convert, value
+                                        in zip(_PS_ROW_FIELDS, _PS_ROW_CONVERTERS, values)}
                         
                         # 在日志中输出完整的进程命令
-                        logger.info(f"监控进程 PID {pid}: {full_args}")
+                        logger.debug("监控进程 PID %s: %s", pid, process_info['args'])
                         
                         return process_info
             else:
                 # 进程不存在，返回None
-                logger.warning(f"进程 PID {pid} 不存在或已结束")
+                logger.debug("进程 PID %s 不存在或已结束", pid)
                 return None
         except subprocess.TimeoutExpired:
             logger.warning(f"ps command timeout (PID: {pid})")
             return None
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Failed to get process info (PID: {pid}): {e}")
             return None
     
+    def read_proc_file(self, pid, name):
+        """Read /proc/<pid>/<name>, keeping its descriptor open across sampling ticks"""
+        # A descriptor must not be closed by close_proc_files while it is being read
+        with self._proc_fd_lock:
+            fds = self._proc_fd_cache.setdefault(pid, {})
+            fd = fds.get(name)
+            if fd is None:
+                try:
+                    fd = os.open(f'/proc/{pid}/{name}', os.O_RDONLY)
+                except OSError:
+                    if not fds:
+                        del self._proc_fd_cache[pid]
+                    raise
+                fds[name] = fd
+            
+            try:
+                # pread at offset 0 regenerates the file contents without an lseek
+                content = os.pread(fd, 65536, 0)
+                while len(content) % 65536 == 0 and content:
+                    chunk = os.pread(fd, 65536, len(content))
+                    if not chunk:
+                        break
+                    content += chunk
+                return content
+            except OSError:
+                # ESRCH once the process has exited: drop all of its descriptors
+                for cached_fd in self._proc_fd_cache.pop(pid, {}).values():
+                    os.close(cached_fd)
+                raise
     
+    def close_proc_files(self, pid=None):
+        """Close cached /proc descriptors of one process, or of all processes"""
+        with self._proc_fd_lock:
+            pids = [pid] if pid is not None else list(self._proc_fd_cache)
+            for cached_pid in pids:
+                for fd in self._proc_fd_cache.pop(cached_pid, {}).values():
+                    os.close(fd)
     
+    def watch_process_exit(self, pid, start_ticks=None):
+        """Watch a process through a pidfd so the sampling loop wakes up when it exits (Linux)"""
+        if self._exit_poller is None:
+            return
+        with self._exit_watch_lock:
+            # An exited but unreaped (zombie) process keeps its pidfd readable, so
+            # watching it again would wake every poll and the loop would spin.
+            # A new process that reuses the PID has another start time and is watched.
+            if pid in self._exit_pidfds or self._exited_starts.get(pid, -1) == start_ticks:
+                return
+            try:
+                fd = os.pidfd_open(pid)
+            except OSError:
+                # Already gone, or a kernel without pidfd support
+                return
+            self._exit_pidfds[pid] = (fd, start_ticks)
+            self._exit_poller.register(fd, select.EPOLLIN)
+    
+    def wait_for_process_exit(self, timeout):
+        """Sleep up to timeout seconds, returning early with the PIDs of watched processes that exited"""
+        if self._exit_poller is None or not self._exit_pidfds:
+            # stop_monitoring cuts the sleep short
+            self._stop_event.wait(timeout)
+            return []
+        
+        # Also returns early once stop_monitoring writes to the wake pipe
+        events = self._exit_poller.poll(timeout)
+        exited = []
+        with self._exit_watch_lock:
+            pid_by_fd = {fd: pid for pid, (fd, _) in self._exit_pidfds.items()}
+            for fd, _ in events:
+                pid = pid_by_fd.get(fd)
+                if pid is None:
+                    continue
+                self._exit_poller.unregister(fd)
+                os.close(fd)
+                self._exited_starts[pid] = self._exit_pidfds.pop(pid)[1]
+                exited.append(pid)
+        
+        for pid in exited:
+            logger.info(f"进程 PID {pid} 已退出")
+            self.close_proc_files(pid)
+            for target, (cached_pid, _) in list(self._target_pid_cache.items()):
+                if cached_pid == pid:
+                    self._target_pid_cache.pop(target, None)
+        return exited
+    
+    def close_exit_watches(self):
+        """Close the pidfds and epoll instance used for exit detection"""
+        with self._exit_watch_lock:
+            for fd, _ in self._exit_pidfds.values():
+                os.close(fd)
+            self._exit_pidfds.clear()
+            self._exited_starts.clear()
+            if self._exit_poller is not None:
+                self._exit_poller.close()
+                self._exit_poller = None
+            if self._exit_wake_pipe is not None:
+                for fd in self._exit_wake_pipe:
+                    os.close(fd)
+                self._exit_wake_pipe = None
+    
+    def read_proc_process_info(self, pid):
+        """Read the ps fields of a process directly from /proc (Linux), without forking ps"""
+        try:
+            stat = self.read_proc_file(pid, 'stat')
+            status = self.read_proc_file(pid, 'status')
+            cmdline = self.read_proc_file(pid, 'cmdline')
+        except OSError:
+            # 进程不存在，返回None
+            return None
+        
+        try:
+            # comm may contain spaces or parentheses, so fields resume after the last ')'
+            comm_end = stat.rindex(b')')
+            comm = stat[stat.index(b'(') + 1:comm_end].decode('utf-8', 'replace')
+            fields = stat[comm_end + 2:].split()  # fields[0] is field 3 (state) in proc(5)
+            if fields[0] == b'Z':
+                # Zombie: exited but not yet reaped by its parent, treat it as gone
+                self.close_proc_files(pid)
+                return None
+            
+            clock_ticks = os.sysconf('SC_CLK_TCK')
+            cpu_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+            elapsed = time.clock_gettime(time.CLOCK_BOOTTIME) - int(fields[19]) / clock_ticks  # starttime
+            vmrss = _STATUS_VMRSS_RE.search(status)
+            rss_kb = int(vmrss.group(1)) if vmrss else 0  # Kernel threads have no VmRSS line
+            
+            if self._mem_total_kb is None:
+                with open('/proc/meminfo', 'r') as f:
+                    for line in f:
+                        if line.startswith('MemTotal:'):
+                            self._mem_total_kb = int(line.split()[1])
+                            break
+            
+            # Same definitions as ps: %cpu is CPU time over lifetime, %mem is RSS over
+            # total memory, both in integer tenths of a percent (truncated, not rounded)
+            pcpu = int(cpu_ticks * 1000 // clock_ticks / elapsed) if elapsed > 0 else 0
+            pmem = min(rss_kb * 1000 // self._mem_total_kb, 999) if self._mem_total_kb else 0
+            args = cmdline.rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
+            return {
+                'pid': pid,
+                'ppid': int(fields[1]),
+                'cpu_percent': pcpu / 10,
+                'memory_percent': pmem / 10,
+                'rss_kb': rss_kb,
+                'vsz_kb': int(fields[20]) // 1024,
+                'etime': format_elapsed(elapsed),
+                'start_ticks': int(fields[19]),  # Tells a reused PID apart from the exited process
+                'comm': comm,
+                'args': args or f'[{comm}]'  # Kernel threads have no command line
+            }
+        except (ValueError, IndexError, OSError) as e:
+            logger.error(f"Failed to get process info (PID: {pid}): {e}")
+            return None
     
     def get_file_descriptors_info(self, pid):
         """Get file descriptors count for a process"""
         try:
-            import platform
-            system = platform.system()
-            
-            if system == "Darwin":  # macOS
-                # Use lsof to count file descriptors
+            if self._is_darwin:  # macOS
+                fd_count = self.count_fds_libproc(pid)
+                if fd_count is not None:
+                    return {'fd_count': fd_count}
+                
+                # Fall back to lsof to count file descriptors
                 cmd = ['lsof', '-p', str(pid)]
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
                 if result.returncode == 0 and result.stdout.strip():
@@ -777,26 +1301,50 @@ class ProcessMonitor:
                     logger.debug(f"lsof failed for PID {pid}: {result.stderr}")
                 return {'fd_count': 0}
             else:  # Linux
-                # Count files in /proc/pid/fd directory
+                # Count entries in /proc/pid/fd without building a list
                 try:
-                    fd_dir = f'/proc/{pid}/fd'
-                    if os.path.exists(fd_dir):
-                        fd_count = len(os.listdir(fd_dir))
-                        return {'fd_count': fd_count}
-                    return {'fd_count': 0}
+                    fd_count = 0
+                    with os.scandir(f'/proc/{pid}/fd') as it:
+                        for _ in it:
+                            fd_count += 1
+                    return {'fd_count': fd_count}
                 except (OSError, PermissionError):
                     return {'fd_count': 0}
-        except Exception as e:
+        except (OSError, subprocess.SubprocessError) as e:
             logger.debug(f"Failed to get file descriptors info for PID {pid}: {e}")
             return {'fd_count': 0}
     
+    def count_fds_libproc(self, pid):
+        """Count open file descriptors via libproc proc_pidinfo, None if unavailable (macOS)"""
+        if self._libproc is None:
+            try:
+                import ctypes
+                libproc = ctypes.CDLL('/usr/lib/libproc.dylib', use_errno=True)
+                libproc.proc_pidinfo.restype = ctypes.c_int
+                libproc.proc_pidinfo.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_uint64,
+                                                 ctypes.c_void_p, ctypes.c_int]
+                self._libproc = libproc
+            except (OSError, AttributeError) as e:
+                logger.debug(f"libproc unavailable, falling back to lsof: {e}")
+                self._libproc = False
+        if not self._libproc:
+            return None
+        
+        import ctypes
+        PROC_PIDLISTFDS = 1
+        PROC_FDINFO_SIZE = 8  # sizeof(struct proc_fdinfo)
+        # A NULL buffer returns an upper bound on the size of the fd list
+        size = self._libproc.proc_pidinfo(pid, PROC_PIDLISTFDS, 0, None, 0)
+        if size <= 0:
+            return 0
+        buf = ctypes.create_string_buffer(size)
+        used = self._libproc.proc_pidinfo(pid, PROC_PIDLISTFDS, 0, buf, size)
+        return max(0, used) // PROC_FDINFO_SIZE
+    
     def get_thread_count_info(self, pid):
         """Get thread count information for a process"""
         try:
-            import platform
-            system = platform.system()
-            
-            if system == "Darwin":  # macOS
+            if self._is_darwin:  # macOS
                 # Use ps -M to get thread count (count lines minus header)
                 cmd = ['ps', '-p', str(pid), '-M']
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
@@ -817,99 +1365,106 @@ class ProcessMonitor:
             else:  # Linux
                 # Read from /proc/pid/status
                 try:
-                    with open(f'/proc/{pid}/status', 'r') as f:
-                        for line in f:
-                            if line.startswith('Threads:'):
-                                return {'thread_count': int(line.split(':')[1].strip())}
-                    return {'thread_count': 0}
-                except FileNotFoundError:
+                    status = self.read_proc_file(pid, 'status')
+                except OSError:
                     return {'thread_count': 0}
-        except Exception as e:
+                match = _STATUS_THREADS_RE.search(status)
+                return {'thread_count': int(match.group(1)) if match else 0}
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
             logger.debug(f"Failed to get thread count info for PID {pid}: {e}")
             return {'thread_count': 0}
     
     def get_system_info(self):
         """Get system overall information"""
         try:
-            import platform
-            system = platform.system()
-            
-            if system == "Darwin":  # macOS
-                # 使用top命令获取系统负载
-                result = subprocess.run(['top', '-l', '1', '-n', '0'], 
-                                      capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    lines = result.stdout.split('\n')
-                    load_avg = 0.0
-                    for line in lines:
-                        if 'load averages:' in line:
-                            parts = line.split('load averages:')[1].strip().split()
-                            if parts:
-                                load_avg = float(parts[0])
-                            break
+            if self._is_darwin:  # macOS
+                # 系统负载直接来自 getloadavg(3)
+                load_1min, load_5min, load_15min = os.getloadavg()
                 
-                # 使用vm_stat获取内存信息
-                result = subprocess.run(['vm_stat'], capture_output=True, text=True, timeout=5)
-                mem_total_kb = 0
-                mem_free_kb = 0
-                if result.returncode == 0:
-                    lines = result.stdout.split('\n')
-                    for line in lines:
-                        if 'Pages free:' in line:
-                            parts = line.split(':')
-                            if len(parts) > 1:
-                                mem_free_kb = int(parts[1].strip().rstrip('.')) * 4  # 4KB per page
-                        elif 'Pages active:' in line:
-                            parts = line.split(':')
-                            if len(parts) > 1:
-                                mem_total_kb += int(parts[1].strip().rstrip('.')) * 4
-                        elif 'Pages inactive:' in line:
-                            parts = line.split(':')
-                            if len(parts) > 1:
-                                mem_total_kb += int(parts[1].strip().rstrip('.')) * 4
-                        elif 'Pages speculative:' in line:
-                            parts = line.split(':')
-                            if len(parts) > 1:
-                                mem_total_kb += int(parts[1].strip().rstrip('.')) * 4
-                        elif 'Pages wired down:' in line:
-                            parts = line.split(':')
-                            if len(parts) > 1:
-                                mem_total_kb += int(parts[1].strip().rstrip('.')) * 4
+                # 内存页统计来自 host_statistics64，与 vm_stat 相同的数据源
+                vm = self.read_host_vm_info()
+                page_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+                mem_total_kb = (vm.active_count + vm.inactive_count + vm.speculative_count
+                                + vm.wire_count) * page_kb
+                mem_free_kb = vm.free_count * page_kb
                 
                 return {
-                    'load_1min': load_avg,
-                    'load_5min': load_avg,
-                    'load_15min': load_avg,
+                    'load_1min': load_1min,
+                    'load_5min': load_5min,
+                    'load_15min': load_15min,
                     'mem_total_kb': mem_total_kb,
                     'mem_available_kb': mem_free_kb,
                     'mem_free_kb': mem_free_kb
                 }
             else:  # Linux
                 # 获取系统负载
-                with open('/proc/loadavg', 'r') as f:
-                    loadavg = f.read().strip().split()
+                fd = os.open('/proc/loadavg', os.O_RDONLY)
+                try:
+                    loadavg = _LOADAVG_RE.match(os.read(fd, 256))
+                finally:
+                    os.close(fd)
+                if loadavg is None:
+                    raise ValueError("unexpected /proc/loadavg format")
                 
-                # 获取内存信息
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = {}
-                    for line in f:
-                        if ':' in line:
-                            key, value = line.split(':', 1)
-                            meminfo[key.strip()] = value.strip()
+                # 获取内存信息（一次读取整个文件）
+                fd = os.open('/proc/meminfo', os.O_RDONLY)
+                try:
+                    meminfo = dict(_MEMINFO_RE.findall(os.read(fd, 8192)))
+                finally:
+                    os.close(fd)
                 
                 return {
-                    'load_1min': float(loadavg[0]),
-                    'load_5min': float(loadavg[1]),
-                    'load_15min': float(loadavg[2]),
-                    'mem_total_kb': int(meminfo.get('MemTotal', '0').split()[0]),
-                    'mem_available_kb': int(meminfo.get('MemAvailable', '0').split()[0]),
-                    'mem_free_kb': int(meminfo.get('MemFree', '0').split()[0])
+                    'load_1min': float(loadavg.group(1)),
+                    'load_5min': float(loadavg.group(2)),
+                    'load_15min': float(loadavg.group(3)),
+                    'mem_total_kb': int(meminfo.get(b'MemTotal', 0)),
+                    'mem_available_kb': int(meminfo.get(b'MemAvailable', 0)),
+                    'mem_free_kb': int(meminfo.get(b'MemFree', 0))
                 }
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Failed to get system info: {e}")
             return None
     
-    def collect_data_for_target(self, target):
+    def read_host_vm_info(self):
+        """Read vm_statistics64 page counts via host_statistics64 (macOS)"""
+        import ctypes
+        if self._mach_vm is None:
+            natural_t = ctypes.c_uint32
+            
+            class VMStatistics64(ctypes.Structure):
+                _fields_ = [
+                    ('free_count', natural_t), ('active_count', natural_t),
+                    ('inactive_count', natural_t), ('wire_count', natural_t),
+                    ('zero_fill_count', ctypes.c_uint64), ('reactivations', ctypes.c_uint64),
+                    ('pageins', ctypes.c_uint64), ('pageouts', ctypes.c_uint64),
+                    ('faults', ctypes.c_uint64), ('cow_faults', ctypes.c_uint64),
+                    ('lookups', ctypes.c_uint64), ('hits', ctypes.c_uint64),
+                    ('purges', ctypes.c_uint64), ('purgeable_count', natural_t),
+                    ('speculative_count', natural_t), ('decompressions', ctypes.c_uint64),
+                    ('compressions', ctypes.c_uint64), ('swapins', ctypes.c_uint64),
+                    ('swapouts', ctypes.c_uint64), ('compressor_page_count', natural_t),
+                    ('throttled_count', natural_t), ('external_page_count', natural_t),
+                    ('internal_page_count', natural_t),
+                    ('total_uncompressed_pages_in_compressor', ctypes.c_uint64),
+                ]
+            
+            libsystem = ctypes.CDLL('/usr/lib/libSystem.B.dylib')
+            libsystem.mach_host_self.restype = ctypes.c_uint32
+            libsystem.host_statistics64.restype = ctypes.c_int
+            libsystem.host_statistics64.argtypes = [ctypes.c_uint32, ctypes.c_int, ctypes.c_void_p,
+                                                    ctypes.POINTER(ctypes.c_uint32)]
+            self._mach_vm = (libsystem, libsystem.mach_host_self(), VMStatistics64)
+        
+        libsystem, host, VMStatistics64 = self._mach_vm
+        HOST_VM_INFO64 = 4
+        vm = VMStatistics64()
+        count = ctypes.c_uint32(ctypes.sizeof(vm) // ctypes.sizeof(ctypes.c_int32))  # HOST_VM_INFO64_COUNT
+        kr = libsystem.host_statistics64(host, HOST_VM_INFO64, ctypes.byref(vm), ctypes.byref(count))
+        if kr != 0:
+            raise OSError(f"host_statistics64 failed with kern_return_t {kr}")
+        return vm
+    
+    def collect_data_for_target(self, target, system_info=None, timestamp=None):
         """Collect resource usage data for specified target"""
         try:
             if self.is_pid(target):
@@ -918,35 +1473,49 @@ class ProcessMonitor:
                 process_info = self.get_process_info(pid)
                 if not process_info:
                     # 进程不存在，返回零值数据
-                    logger.info(f"进程 PID {pid} 不存在，记录零值数据")
-                    return self.create_zero_data(target, f"PID_{pid}", pid)
+                    logger.debug("进程 PID %s 不存在，记录零值数据", pid)
+                    return self.create_zero_data(target, f"PID_{pid}", pid, system_info, timestamp)
                 target_name = f"PID_{pid}"
+                self.watch_process_exit(pid, process_info.get('start_ticks'))
             else:
-                # Find by process name
-                pids = self.find_process_by_name(target)
-                if not pids:
-                    # 进程不存在，返回零值数据
-                    logger.info(f"进程 {target} 不存在，记录零值数据")
-                    return self.create_zero_data(target, target, None)
+                # Reuse a recent name resolution while that process is still alive
+                process_info = None
+                cached = self._target_pid_cache.get(target)
+                if cached and time.monotonic() - cached[1] < PID_CACHE_TTL:
+                    pid = cached[0]
+                    process_info = self.get_process_info(pid)
+                    if not process_info:
+                        self._target_pid_cache.pop(target, None)
                 
-                # Get first found process info
-                pid = pids[0]
-                process_info = self.get_process_info(pid)
                 if not process_info:
-                    # 进程不存在，返回零值数据
-                    logger.info(f"进程 {target} (PID {pid}) 不存在，记录零值数据")
-                    return self.create_zero_data(target, target, pid)
+                    # Find by process name
+                    pids = self.find_process_by_name(target)
+                    if not pids:
+                        # 进程不存在，返回零值数据
+                        logger.debug("进程 %s 不存在，记录零值数据", target)
+                        return self.create_zero_data(target, target, None, system_info, timestamp)
+                    
+                    # Get first found process info
+                    pid = pids[0]
+                    process_info = self.get_process_info(pid)
+                    if not process_info:
+                        # 进程不存在，返回零值数据
+                        logger.debug("进程 %s (PID %s) 不存在，记录零值数据", target, pid)
+                        return self.create_zero_data(target, target, pid, system_info, timestamp)
+                    self._target_pid_cache[target] = (pid, time.monotonic())
+                    self.watch_process_exit(pid, process_info.get('start_ticks'))
                 target_name = target
             
             # Get system information
-            system_info = self.get_system_info()
+            if system_info is None:
+                system_info = self.get_system_info()
             
             # Calculate memory usage (MB)
             memory_mb = process_info.get('rss_kb', 0) / 1024.0
             
             # Initialize data with basic information
             data = {
-                'timestamp': datetime.now(),
+                'timestamp': timestamp or datetime.now(),
                 'target': target,
                 'target_name': target_name,
                 'pid': pid,
@@ -984,13 +1553,14 @@ class ProcessMonitor:
             logger.error(f"Failed to collect data for target {target}: {e}")
             return None
     
-    def create_zero_data(self, target, target_name, pid):
+    def create_zero_data(self, target, target_name, pid, system_info=None, timestamp=None):
         """Create zero-value data for non-existent processes"""
-        system_info = self.get_system_info()
+        if system_info is None:
+            system_info = self.get_system_info()
         
         # Initialize with basic data
         data = {
-            'timestamp': datetime.now(),
+            'timestamp': timestamp or datetime.now(),
             'target': target,
             'target_name': target_name,
             'pid': pid if pid is not None else 0,
@@ -1018,20 +1588,32 @@ class ProcessMonitor:
         
         return data
     
-    def collect_all_data(self):
+    def collect_all_data(self, timestamp=None):
         """Collect data for all targets"""
         all_data = {}
-        for target in self.targets:
-            data = self.collect_data_for_target(target)
+        # One clock read per tick, shared by every target's sample
+        if timestamp is None:
+            timestamp = datetime.now()
+        # System info is the same for every target within a tick, fetch it once
+        system_info = self.get_system_info()
+        if self._pool is not None:
+            # Targets are independent: overlap their subprocess waits (macOS)
+            futures = [self._pool.submit(self.collect_data_for_target, target, system_info, timestamp)
+                       for target in self.targets]
+            results = [future.result() for future in futures]
+        else:
+            results = [self.collect_data_for_target(target, system_info, timestamp)
+                       for target in self.targets]
+        for target, data in zip(self.targets, results):
             if data:
                 all_data[target] = data
             else:
                 # 即使进程不存在，也创建零值数据
                 logger.warning(f"Target not found: {target}, creating zero data")
-                all_data[target] = self.create_zero_data(target, target, None)
+                all_data[target] = self.create_zero_data(target, target, None, system_info, timestamp)
         return all_data
     
-    def start_monitoring(self, interval=5, duration=None):
+    def start_monitoring(self, interval=5, duration=None, monitor_cpu=None):
         """Start monitoring"""
         if self.monitoring:
             logger.warning("Monitoring is already running")
@@ -1045,11 +1627,28 @@ class ProcessMonitor:
         self.monitoring_duration = duration
         
         self.monitoring = True
-        self.data = defaultdict(list)
+        self._stop_event.clear()
+        self.data = defaultdict(SampleSeries)
+        self._column_cache.clear()
+        if self._is_darwin and len(self.targets) > 1:
+            # Only macOS collects through ps/pgrep/lsof subprocesses whose waits release the GIL.
+            # Linux reads procfs in-process, which threads pinned to the monitor's CPU
+            # (pin_monitor_thread) could only run one at a time anyway.
+            # Imported here: report and load-data runs never start collector threads
+            import concurrent.futures
+            self._pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(32, len(self.targets)), thread_name_prefix='collector')
+        if hasattr(os, 'pidfd_open') and hasattr(select, 'epoll'):
+            self._exit_poller = select.epoll()
+            # stop_monitoring writes to this pipe to end a poll before its timeout
+            self._exit_wake_pipe = os.pipe()
+            self._exit_poller.register(self._exit_wake_pipe[0], select.EPOLLIN)
         
         def monitor_loop():
+            self.pin_monitor_thread(monitor_cpu)
             start_time = time.time()
             sample_count = 0
+            zero_streak = 0  # Consecutive ticks in which no target process existed
             
             # Print beautiful header
             print_header("🚀 进程监控系统启动", 120)
@@ -1061,109 +1660,85 @@ class ProcessMonitor:
                 print_info("监控时长: 持续监控 (按 Ctrl+C 停止)")
             print_separator(120)
             
-            # Print beautiful table header for separate process display
-            header = f"{Colors.BOLD}{Colors.CYAN}{'时间':<20}{Colors.RESET} {Colors.BOLD}{Colors.MAGENTA}{'进程名':<15}{Colors.RESET} {Colors.BOLD}{Colors.YELLOW}{'PID':<8}{Colors.RESET}"
-            if self.monitor_config.get('cpu_percent', True):
-                header += f" {Colors.BOLD}{Colors.RED}{'CPU%':<8}{Colors.RESET}"
-            if self.monitor_config.get('memory_percent', True):
-                header += f" {Colors.BOLD}{Colors.GREEN}{'内存%':<8}{Colors.RESET}"
-            if self.monitor_config.get('memory_mb', True):
-                header += f" {Colors.BOLD}{Colors.BLUE}{'内存MB':<8}{Colors.RESET}"
-            if self.monitor_config.get('file_descriptors', False):
-                header += f" {Colors.BOLD}{Colors.BRIGHT_YELLOW}{'文件描述符':<8}{Colors.RESET}"
-            if self.monitor_config.get('thread_count', False):
-                header += f" {Colors.BOLD}{Colors.BRIGHT_GREEN}{'线程数':<8}{Colors.RESET}"
-            print(header)
+            print(self._display_header)
             print_separator(120, "─")  # Use Unicode box drawing character
             
+            metric_columns = self._display_columns
+            row_template = self._row_template
+            zero_rows = self._zero_rows
+            
             while self.monitoring:
                 try:
-                    all_data = self.collect_all_data()
+                    now = datetime.now()
+                    all_data = self.collect_all_data(now)
+                    ts_cell = f"{Colors.BOLD}{Colors.CYAN}{now.strftime('%H:%M:%S'):<20}{Colors.RESET}"
+                    lines = []
                     if all_data:
                         with self.data_lock:
                             for target, data in all_data.items():
                                 self.data[target].append(data)
                         
                         # 实时显示数据 - 每个进程单独一行
-                        timestamp_str = datetime.now().strftime('%H:%M:%S')
-                        
                         for target in self.targets:
-                            line = f"{Colors.BOLD}{Colors.CYAN}{timestamp_str:<20}{Colors.RESET}"
+                            data = all_data.get(target)
+                            if data is None:
+                                lines.append(ts_cell + zero_rows[target])
+                                continue
                             
-                            if target in all_data:
-                                data = all_data[target]
-                                # 如果进程不存在，显示0值而不是N/A
-                                if data['pid'] == 0 or data['cpu_percent'] == 0.0:
-                                    line += f" {Colors.DIM}{target:<15}{Colors.RESET} {Colors.DIM}{'0':<8}{Colors.RESET}"
-                                else:
-                                    line += f" {Colors.MAGENTA}{target:<15}{Colors.RESET} {Colors.YELLOW}{data['pid']:<8}{Colors.RESET}"
-                                
-                                # Add metrics based on configuration with colors
-                                if self.monitor_config.get('cpu_percent', True):
-                                    cpu_val = data['cpu_percent']
-                                    cpu_color = Colors.RED if cpu_val > 50 else Colors.BRIGHT_RED if cpu_val > 20 else Colors.GREEN
-                                    line += f" {cpu_color}{cpu_val:<8.2f}{Colors.RESET}"
-                                if self.monitor_config.get('memory_percent', True):
-                                    mem_val = data['memory_percent']
-                                    mem_color = Colors.GREEN if mem_val > 50 else Colors.BRIGHT_GREEN if mem_val > 20 else Colors.GREEN
-                                    line += f" {mem_color}{mem_val:<8.2f}{Colors.RESET}"
-                                if self.monitor_config.get('memory_mb', True):
-                                    mem_mb_val = data['memory_mb']
-                                    mem_mb_color = Colors.BLUE if mem_mb_val > 100 else Colors.BRIGHT_BLUE if mem_mb_val > 50 else Colors.BLUE
-                                    line += f" {mem_mb_color}{mem_mb_val:<8.2f}{Colors.RESET}"
-                                if self.monitor_config.get('file_descriptors', False):
-                                    fd_count = data.get('fd_count', 0)
-                                    line += f" {Colors.BRIGHT_YELLOW}{fd_count:<8}{Colors.RESET}"
-                                if self.monitor_config.get('thread_count', False):
-                                    threads = data.get('thread_count', 0)
-                                    line += f" {Colors.BRIGHT_GREEN}{threads:<8}{Colors.RESET}"
+                            # 如果进程不存在，显示0值而不是N/A
+                            if data['pid'] == 0 or data['cpu_percent'] == 0.0:
+                                args = [Colors.DIM, target, Colors.DIM, '0']
                             else:
-                                line += f" {Colors.DIM}{target:<15}{Colors.RESET} {Colors.DIM}{'0':<8}{Colors.RESET}"
-                                # Add zero values for all enabled metrics
-                                if self.monitor_config.get('cpu_percent', True):
-                                    line += f" {Colors.DIM}{'0.00':<8}{Colors.RESET}"
-                                if self.monitor_config.get('memory_percent', True):
-                                    line += f" {Colors.DIM}{'0.00':<8}{Colors.RESET}"
-                                if self.monitor_config.get('memory_mb', True):
-                                    line += f" {Colors.DIM}{'0.00':<8}{Colors.RESET}"
-                                if self.monitor_config.get('file_descriptors', False):
-                                    line += f" {Colors.DIM}{'0':<8}{Colors.RESET}"
-                                if self.monitor_config.get('thread_count', False):
-                                    line += f" {Colors.DIM}{'0':<8}{Colors.RESET}"
-                            
-                            print(line)
+                                args = [Colors.MAGENTA, target, Colors.YELLOW, data['pid']]
+                            for key, bins in metric_columns:
+                                value = data.get(key, 0)
+                                for bound, color in bins:
+                                    if value > bound:
+                                        break
+                                args.append(color)
+                                args.append(value)
+                            lines.append(ts_cell + row_template.format(*args))
                         sample_count += 1
                     else:
                         # 没有数据时，每个进程也单独显示一行
-                        timestamp_str = datetime.now().strftime('%H:%M:%S')
                         for target in self.targets:
-                            line = f"{Colors.BOLD}{Colors.CYAN}{timestamp_str:<20}{Colors.RESET}"
-                            line += f" {Colors.DIM}{target:<15}{Colors.RESET} {Colors.DIM}{'0':<8}{Colors.RESET}"
-                            # Add zero values for all enabled metrics
-                            if self.monitor_config.get('cpu_percent', True):
-                                line += f" {Colors.DIM}{'0.00':<8}{Colors.RESET}"
-                            if self.monitor_config.get('memory_percent', True):
-                                line += f" {Colors.DIM}{'0.00':<8}{Colors.RESET}"
-                            if self.monitor_config.get('memory_mb', True):
-                                line += f" {Colors.DIM}{'0.00':<8}{Colors.RESET}"
-                            if self.monitor_config.get('file_descriptors', False):
-                                line += f" {Colors.DIM}{'0':<8}{Colors.RESET}"
-                            if self.monitor_config.get('thread_count', False):
-                                line += f" {Colors.DIM}{'0':<8}{Colors.RESET}"
-                            print(line)
+                            lines.append(ts_cell + zero_rows[target])
+                    
+                    # One write per tick instead of one print per target
+                    print_lines(lines)
                     
                     # Check if monitoring duration reached
-                    if duration and (time.time() - start_time) >= duration:
+                    elapsed = time.time() - start_time
+                    if duration and elapsed >= duration:
                         logger.info(f"Monitoring duration {duration} seconds reached, stopping monitoring")
                         self.monitoring = False
                         break
                     
-                    time.sleep(interval)
+                    # Zero-value samples have no command: when every target has been missing for
+                    # IDLE_BACKOFF_TICKS ticks, double the interval per tick up to 16x until one
+                    # reappears. Sample timestamps always record the actual sampling time.
+                    if all_data and any(data['command'] for data in all_data.values()):
+                        if zero_streak >= IDLE_BACKOFF_TICKS:
+                            logger.info("Target process found, restoring sampling interval")
+                        zero_streak = 0
+                    else:
+                        zero_streak += 1
+                        if zero_streak == IDLE_BACKOFF_TICKS:
+                            logger.info("No target process found, backing off sampling interval")
+                    
+                    sleep_interval = interval
+                    if zero_streak >= IDLE_BACKOFF_TICKS:
+                        sleep_interval = interval * (1 << min(zero_streak - IDLE_BACKOFF_TICKS + 1, 4))
+                        if duration:
+                            sleep_interval = min(sleep_interval, duration - elapsed)
+                    # Wakes up early when a target exits, so its exit is sampled right away
+                    self.wait_for_process_exit(sleep_interval)
                     
                 except Exception as e:
                     logger.error(f"Monitoring loop error: {e}")
-                    time.sleep(interval)
+                    self._stop_event.wait(interval)
             
+            self._stop_event.set()
             print_separator(120, "─")
             print_success(f"监控完成！共收集 {sample_count} 个数据样本")
             print_header("📊 监控统计信息", 120)
@@ -1172,11 +1747,37 @@ class ProcessMonitor:
         self.monitor_thread.start()
         logger.info(f"Started monitoring targets, sampling interval: {interval} seconds")
     
+    def pin_monitor_thread(self, cpu=None):
+        """Pin the calling thread to one CPU, by default the last one allowed (Linux)"""
+        if not hasattr(os, 'sched_setaffinity') or (cpu is not None and cpu < 0):
+            return
+        try:
+            if cpu is None:
+                cpu = max(os.sched_getaffinity(0))
+            # pid 0 is the calling thread; collector threads started from it inherit the mask
+            os.sched_setaffinity(0, {cpu})
+            logger.info(f"Monitor thread pinned to CPU {cpu}")
+        except OSError as e:
+            logger.warning(f"Failed to pin monitor thread to CPU {cpu}: {e}")
+    
+    def wait_until_stopped(self):
+        """Block until the sampling loop ends, e.g. when the monitoring duration is reached"""
+        self._stop_event.wait()
+    
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring = False
+        self._stop_event.set()
+        if self._exit_wake_pipe is not None:
+            # Wake the sampling loop if it is blocked polling target pidfds
+            os.write(self._exit_wake_pipe[1], b'\0')
         if self.monitor_thread:
             self.monitor_thread.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.close_exit_watches()
+        self.close_proc_files()
         logger.info("Monitoring stopped")
     
     def get_data(self):
@@ -1193,12 +1794,27 @@ class ProcessMonitor:
             else:
                 filename = f"process_monitor_data_{timestamp}.json"
         
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            def dumps(obj):
+                return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+        
         try:
+            # Only hold the lock for a snapshot of the sample counts; rows below
+            # those counts are complete and never change while the monitor appends
             with self.data_lock:
-                data_to_save = {}
-                for target, target_data in self.data.items():
-                    data_to_save[target] = []
-                    for item in target_data:
+                snapshot = [(target, target_data, len(target_data))
+                            for target, target_data in self.data.items()]
+            
+            # Stream one JSON object per sample line instead of building the whole document
+            with open(filename, 'wb') as f:
+                f.write(b'{')
+                for target_index, (target, target_data, count) in enumerate(snapshot):
+                    f.write(b',\n' if target_index else b'\n')
+                    f.write(dumps(target) + b': [')
+                    for index in range(count):
+                        item = target_data[index]
                         # Create base data structure
                         save_item = {
                             'timestamp': item['timestamp'].isoformat(),
@@ -1223,10 +1839,10 @@ class ProcessMonitor:
                         if 'thread_count' in item:
                             save_item['thread_count'] = item['thread_count']
                         
-                        data_to_save[target].append(save_item)
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=2)
+                        f.write(b',\n' if index else b'\n')
+                        f.write(dumps(save_item))
+                    f.write(b'\n]')
+                f.write(b'\n}\n')
             
             logger.info(f"Data saved to: {filename}")
             return filename
@@ -1238,38 +1854,37 @@ class ProcessMonitor:
     def load_data_from_file(self, filename):
         """Load data from file"""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            loaded = defaultdict(SampleSeries)
+            for target, item in iter_data_file_samples(filename):
+                # Create base data structure
+                load_item = {
+                    'timestamp': datetime.fromisoformat(item['timestamp']),
+                    'target': item['target'],
+                    'target_name': item['target_name'],
+                    'pid': item['pid'],
+                    'cpu_percent': item['cpu_percent'],
+                    'memory_percent': item['memory_percent'],
+                    'memory_mb': item['memory_mb'],
+                    'rss_kb': item['rss_kb'],
+                    'vsz_kb': item['vsz_kb'],
+                    'command': item['command'],
+                    'args': item['args'],
+                    'system_load': item['system_load'],
+                    'system_mem_available_mb': item['system_mem_available_mb']
+                }
+                
+                # Add optional metrics if they exist in the loaded data
+                if 'fd_count' in item:
+                    load_item['fd_count'] = item['fd_count']
+                
+                if 'thread_count' in item:
+                    load_item['thread_count'] = item['thread_count']
+                
+                loaded[target].append(load_item)
             
             with self.data_lock:
-                self.data = defaultdict(list)
-                for target, target_data in data.items():
-                    for item in target_data:
-                        # Create base data structure
-                        load_item = {
-                            'timestamp': datetime.fromisoformat(item['timestamp']),
-                            'target': item['target'],
-                            'target_name': item['target_name'],
-                            'pid': item['pid'],
-                            'cpu_percent': item['cpu_percent'],
-                            'memory_percent': item['memory_percent'],
-                            'memory_mb': item['memory_mb'],
-                            'rss_kb': item['rss_kb'],
-                            'vsz_kb': item['vsz_kb'],
-                            'command': item['command'],
-                            'args': item['args'],
-                            'system_load': item['system_load'],
-                            'system_mem_available_mb': item['system_mem_available_mb']
-                        }
-                        
-                        # Add optional metrics if they exist in the loaded data
-                        if 'fd_count' in item:
-                            load_item['fd_count'] = item['fd_count']
-                        
-                        if 'thread_count' in item:
-                            load_item['thread_count'] = item['thread_count']
-                        
-                        self.data[target].append(load_item)
+                self.data = loaded
+                self._column_cache.clear()
             
             logger.info(f"Loaded {sum(len(target_data) for target_data in self.data.values())} data points from file: {filename}")
             return True
@@ -1283,9 +1898,14 @@ class ProcessMonitor:
         try:
             # Check if matplotlib is available
             try:
+                import matplotlib
+                if not show_plot and 'matplotlib.pyplot' not in sys.modules:
+                    # Saving only: the non-interactive Agg backend skips GUI toolkit setup
+                    matplotlib.use('Agg')
                 import matplotlib.pyplot as plt
                 import matplotlib.dates as mdates
                 import matplotlib.font_manager as fm
+                import numpy as np
             except ImportError:
                 logger.error("matplotlib not installed, cannot generate visualization charts")
                 logger.info("Please run: pip3 install matplotlib")
@@ -1297,8 +1917,7 @@ class ProcessMonitor:
                 return
             
             # Set font to support Chinese characters and emoji
-            import platform
-            system = platform.system()
+            system = self._system
             
             if system == "Darwin":  # macOS
                 # Use system fonts that support Chinese and emoji
@@ -1337,15 +1956,44 @@ class ProcessMonitor:
                 logger.warning("No metrics enabled for visualization")
                 return
             
+            # Extract timestamps and metric columns once per target, shared by all charts and stats
+            timestamps_by_target = {}
+            columns_by_target = {}
+            for target, target_data in data.items():
+                if target_data:
+                    timestamps_by_target[target], columns_by_target[target] = \
+                        self.get_target_columns(target, target_data, enabled_metrics)
+            
+            # (mean, max) per target and metric, shared by the y-axis limits and the statistics
+            mean_max_by_target = {target: {metric: column_mean_max(column) for metric, column in columns.items()}
+                                  for target, columns in columns_by_target.items()}
+            
+            # Time axis ticks per target, shared by all of its charts: (positions, labels, per-second minor ticks)
+            time_axis_by_target = {}
+            for target, timestamps in timestamps_by_target.items():
+                if show_all_ticks and len(timestamps) <= max_ticks:
+                    selected_timestamps = timestamps
+                else:
+                    if len(timestamps) <= max_ticks:
+                        step = 1
+                    else:
+                        step = max(1, len(timestamps) // max_ticks)
+                    selected_timestamps = timestamps[::step]
+                tick_labels = [t.strftime('%H:%M:%S') for t in selected_timestamps.tolist()]
+                # Per-second minor ticks only stay legible (and cheap) on short spans
+                second_ticks = timestamps[-1] - timestamps[0] <= np.timedelta64(60, 's')
+                time_axis_by_target[target] = (selected_timestamps, tick_labels, second_ticks)
+            
+            # Horizontal pixels per chart; longer series are reduced to their M4 points
+            chart_width_px = 6 * CHART_DPI
+            sample_times_by_target = {}
+            for target, timestamps in timestamps_by_target.items():
+                if len(timestamps) > 4 * chart_width_px:
+                    sample_times_by_target[target] = mdates.date2num(timestamps)
+            
             # Create subplots: one row per metric, one column per target
             # Increase figure size and add more spacing between charts
-            fig, axes = plt.subplots(num_charts, num_targets, figsize=(6 * num_targets, 4 * num_charts))
-            
-            # If only one target, ensure axes is 2D array
-            if num_targets == 1:
-                axes = axes.reshape(-1, 1)
-            elif num_charts == 1:
-                axes = axes.reshape(1, -1)
+            fig, axes = self.get_chart_figure(plt, num_charts, num_targets)
             
             # Set main title with better styling
             fig.suptitle('Process Resource Monitoring Report', fontsize=18, fontweight='bold', y=0.95)
@@ -1356,58 +2004,33 @@ class ProcessMonitor:
                     if not target_data:
                         continue
                     
-                    # Parse data
-                    timestamps = [item['timestamp'] for item in target_data]
-                    
-                    # Set time axis display
-                    if show_all_ticks and len(timestamps) <= max_ticks:
-                        selected_timestamps = timestamps
-                    else:
-                        if len(timestamps) <= max_ticks:
-                            step = 1
-                        else:
-                            step = max(1, len(timestamps) // max_ticks)
-                        selected_timestamps = timestamps[::step]
+                    timestamps = timestamps_by_target[target]
+                    columns = columns_by_target[target]
+                    selected_timestamps, tick_labels, second_ticks = time_axis_by_target[target]
                     
                     # Get data for this metric
-                    if metric == 'cpu_percent':
-                        metric_data = [item['cpu_percent'] for item in target_data]
-                        ylabel = 'CPU Usage (%)'
-                        title = f'{target}\nCPU Usage'
-                        color = 'b'
-                        marker = 'o'
-                    elif metric == 'memory_percent':
-                        metric_data = [item['memory_percent'] for item in target_data]
-                        ylabel = 'Memory Usage (%)'
-                        title = f'{target}\nMemory Usage %'
-                        color = 'r'
-                        marker = 's'
-                    elif metric == 'memory_mb':
-                        metric_data = [item['memory_mb'] for item in target_data]
-                        ylabel = 'Memory Usage (MB)'
-                        title = f'{target}\nMemory Usage'
-                        color = 'g'
-                        marker = '^'
-                    elif metric == 'fd_count':
-                        metric_data = [item.get('fd_count', 0) for item in target_data]
-                        ylabel = 'File Descriptors'
-                        title = f'{target}\nFile Descriptors'
-                        color = 'orange'
-                        marker = 'D'
-                    elif metric == 'thread_count':
-                        metric_data = [item.get('thread_count', 0) for item in target_data]
-                        ylabel = 'Thread Count'
-                        title = f'{target}\nThread Count'
-                        color = 'gray'
-                        marker = 'h'
-                    else:
+                    style = CHART_METRIC_STYLES.get(metric)
+                    if style is None:
                         continue
+                    ylabel, title_suffix, color, marker = style
+                    metric_data = columns[metric]
+                    title = f'{target}\n{title_suffix}'
                     
                     # Create the chart with improved styling
-                    ax = axes[metric_idx, target_idx] if num_charts > 1 else axes[target_idx]
-                    ax.plot(timestamps, metric_data, color=color, linewidth=2.5, marker=marker, 
-                           markersize=4, markerfacecolor='white', markeredgecolor=color, 
-                           markeredgewidth=1.5)
+                    ax = axes[metric_idx, target_idx]
+                    plot_timestamps = timestamps
+                    if target in sample_times_by_target:
+                        keep = m4_indices(sample_times_by_target[target], metric_data, chart_width_px)
+                        plot_timestamps = timestamps[keep]
+                        metric_data = metric_data[keep]
+                    
+                    if len(timestamps) <= CHART_MARKER_MAX_POINTS:
+                        ax.plot(timestamps, metric_data, color=color, linewidth=2.5, marker=marker, 
+                               markersize=4, markerfacecolor='white', markeredgecolor=color, 
+                               markeredgewidth=1.5)
+                    else:
+                        # Markers would overlap into a solid band and dominate rendering time
+                        ax.plot(plot_timestamps, metric_data, color=color, linewidth=2.5)
                     ax.set_ylabel(ylabel, fontsize=11, fontweight='bold')
                     ax.set_title(title, fontsize=13, fontweight='bold', pad=8)
                     ax.grid(True, linestyle='--', linewidth=0.8)
@@ -1416,17 +2039,17 @@ class ProcessMonitor:
                     ax.set_facecolor('#f8f9fa')
                     
                     # Set y-axis range
-                    metric_max = max(metric_data) if metric_data else 0
+                    metric_max = mean_max_by_target[target][metric][1]
                     if metric_max > 0:
                         ax.set_ylim(0, metric_max * 1.1)
                     else:
                         ax.set_ylim(0, 10)  # When all data is 0, set a small range
                     
                     # Set time axis with improved styling
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-                    ax.set_xticks(selected_timestamps)
+                    ax.set_xticks(selected_timestamps, labels=tick_labels)
                     plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right', fontsize=9, fontweight='bold')
-                    ax.xaxis.set_minor_locator(mdates.SecondLocator(interval=1))
+                    if second_ticks:
+                        ax.xaxis.set_minor_locator(mdates.SecondLocator(interval=1))
                     ax.tick_params(axis='x', which='minor', length=3)
                     ax.tick_params(axis='y', labelsize=9, labelcolor='#333333')
                     
@@ -1434,10 +2057,9 @@ class ProcessMonitor:
                     if metric_idx == num_charts - 1:
                         ax.set_xlabel('Time', fontsize=11, fontweight='bold', color='#333333')
             
-            # Adjust layout with more spacing between charts
-            plt.tight_layout()
-            # Increase spacing between subplots with more white space around charts
-            plt.subplots_adjust(
+            # Fixed margins and spacing between charts; no tight_layout or bbox_inches='tight'
+            # pass is needed on top, which saves two full layout computations per render
+            fig.subplots_adjust(
                 bottom=0.15,  # More space at bottom for x-axis labels
                 top=0.88,     # More space at top for title
                 left=0.10,    # More space on left
@@ -1448,26 +2070,29 @@ class ProcessMonitor:
             
             # Save or display chart
             if output_file:
-                plt.savefig(output_file, dpi=300, bbox_inches='tight')
-                logger.info(f"Chart saved to: {output_file}")
+                chart_file = output_file
             elif self.report_dir:
                 # Auto-save to report directory if no specific output file
                 chart_file = os.path.join(self.report_dir, "performance_chart.png")
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                logger.info(f"Chart saved to: {chart_file}")
             else:
                 # Default save to current directory if no output file or report directory
                 chart_file = "performance_chart.png"
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                logger.info(f"Chart saved to: {chart_file}")
+            self.save_chart(fig, chart_file)
+            logger.info(f"Chart saved to: {chart_file}")
             
             if show_plot:
                 plt.show()
+                # A figure closed by the viewer cannot be redrawn, so do not reuse it
+                plt.close(fig)
+                self._figure_cache.pop((num_charts, num_targets), None)
             
-            # Generate statistics
+            # Generate statistics; enabled metrics are resolved once, not per target
+            stat_metrics = [metric for metric in ('cpu_percent', 'memory_mb', 'memory_percent', 'fd_count', 'thread_count')
+                            if metric in enabled_metrics]
             stats = {}
             for target, target_data in data.items():
                 if target_data:
+                    mean_max = mean_max_by_target[target]
                     stats[target] = {
                         'data_points': len(target_data),
                         'pid': target_data[0]['pid'],
@@ -1475,40 +2100,10 @@ class ProcessMonitor:
                     }
                     
                     # Add statistics for enabled metrics
-                    if self.monitor_config.get('cpu_percent', True):
-                        cpu_data = [item['cpu_percent'] for item in target_data]
-                        stats[target].update({
-                            'avg_cpu_percent': round(sum(cpu_data) / len(cpu_data), 2),
-                            'max_cpu_percent': round(max(cpu_data), 2)
-                        })
-                    
-                    if self.monitor_config.get('memory_mb', True):
-                        memory_mb_data = [item['memory_mb'] for item in target_data]
-                        stats[target].update({
-                            'avg_memory_mb': round(sum(memory_mb_data) / len(memory_mb_data), 2),
-                            'max_memory_mb': round(max(memory_mb_data), 2)
-                        })
-                    
-                    if self.monitor_config.get('memory_percent', True):
-                        memory_percent_data = [item['memory_percent'] for item in target_data]
-                        stats[target].update({
-                            'avg_memory_percent': round(sum(memory_percent_data) / len(memory_percent_data), 2),
-                            'max_memory_percent': round(max(memory_percent_data), 2)
-                        })
-                    
-                    if self.monitor_config.get('file_descriptors', False):
-                        fd_data = [item.get('fd_count', 0) for item in target_data]
-                        stats[target].update({
-                            'avg_fd_count': round(sum(fd_data) / len(fd_data), 2),
-                            'max_fd_count': round(max(fd_data), 2)
-                        })
-                    
-                    if self.monitor_config.get('thread_count', False):
-                        thread_data = [item.get('thread_count', 0) for item in target_data]
-                        stats[target].update({
-                            'avg_thread_count': round(sum(thread_data) / len(thread_data), 2),
-                            'max_thread_count': round(max(thread_data), 2)
-                        })
+                    for metric in stat_metrics:
+                        avg_value, max_value = mean_max[metric]
+                        stats[target][f'avg_{metric}'] = round(avg_value, 2)
+                        stats[target][f'max_{metric}'] = round(max_value, 2)
             
             logger.info(f"Process monitoring statistics:")
             for target, target_stats in stats.items():
@@ -1522,6 +2117,52 @@ class ProcessMonitor:
             logger.error(f"Failed to generate visualization: {e}")
             return None
     
+    def save_chart(self, fig, chart_file):
+        """Save a chart figure, encoding PNG output with fast zlib compression"""
+        save_kwargs = {}
+        # Without an extension matplotlib saves as PNG
+        if os.path.splitext(chart_file)[1].lower() in ('', '.png'):
+            save_kwargs['pil_kwargs'] = {'compress_level': CHART_PNG_COMPRESS_LEVEL}
+        fig.savefig(chart_file, dpi=CHART_DPI, **save_kwargs)
+    
+    def get_chart_figure(self, plt, rows, cols):
+        """Return (figure, 2D axes array) for a chart grid, reusing the figure of earlier renders"""
+        cached = self._figure_cache.get((rows, cols))
+        if cached is not None:
+            fig, axes = cached
+            for ax in axes.flat:
+                ax.clear()
+            return fig, axes
+        
+        # squeeze=False keeps axes 2D even for a single metric or target
+        fig, axes = plt.subplots(rows, cols, figsize=(6 * cols, 4 * rows), squeeze=False)
+        self._figure_cache[(rows, cols)] = (fig, axes)
+        return fig, axes
+    
+    def get_target_columns(self, target, target_data, metrics):
+        """Return (datetime64 timestamps, {metric: ndarray}) for a target, reusing them until new samples arrive"""
+        import numpy as np
+        key = (id(target_data), len(target_data), tuple(metrics))
+        cached = self._column_cache.get(target)
+        if cached is None or cached[0] != key:
+            # One vectorized cast instead of a datetime object per sample
+            timestamps = np.array(target_data.timestamp_micros(), dtype=np.int64).view('datetime64[us]')
+            cached = (key, timestamps, self.get_metric_columns(target_data, metrics))
+            self._column_cache[target] = cached
+        return cached[1], cached[2]
+    
+    def get_metric_columns(self, target_data, metrics):
+        """Return {metric: ndarray} for one target's samples, zeros for metrics it lacks"""
+        import numpy as np
+        columns = {}
+        for metric in metrics:
+            try:
+                # Copy rather than view: a live buffer export would block further appends
+                columns[metric] = np.array(target_data.column(metric))
+            except KeyError:
+                columns[metric] = np.zeros(len(target_data), dtype=np.int64)
+        return columns
+    
     def print_summary(self):
         """Print monitoring summary"""
         data = self.get_data()
@@ -1531,14 +2172,15 @@ class ProcessMonitor:
         
         print_header("📈 进程监控汇总报告", 100)
         
+        lines = []
         for target, target_data in data.items():
             if not target_data:
                 continue
             
-            # 计算统计信息
-            cpu_data = [item['cpu_percent'] for item in target_data]
-            memory_mb_data = [item['memory_mb'] for item in target_data]
-            memory_percent_data = [item['memory_percent'] for item in target_data]
+            # 计算统计信息（直接使用列数据，无需逐条遍历样本）
+            cpu_data = target_data.column('cpu_percent')
+            memory_mb_data = target_data.column('memory_mb')
+            memory_percent_data = target_data.column('memory_percent')
             
             avg_cpu = sum(cpu_data) / len(cpu_data)
             max_cpu = max(cpu_data)
@@ -1547,26 +2189,23 @@ class ProcessMonitor:
             avg_memory_percent = sum(memory_percent_data) / len(memory_percent_data)
             max_memory_percent = max(memory_percent_data)
             
-            duration = (target_data[-1]['timestamp'] - target_data[0]['timestamp']).total_seconds()
-            
-            print(f"\n{Colors.BOLD}{Colors.MAGENTA}🎯 监控目标: {target}{Colors.RESET}")
-            print(f"  {Colors.YELLOW}📋 PID:{Colors.RESET} {target_data[0]['pid']}")
-            print(f"  {Colors.BLUE}⚙️  命令:{Colors.RESET} {target_data[0]['command']}")
-            print(f"  {Colors.CYAN}⏱️  监控时长:{Colors.RESET} {duration:.0f} 秒")
-            print(f"  {Colors.GREEN}📊 数据样本:{Colors.RESET} {len(target_data)} 个")
-            
-            # CPU 使用率统计
-            cpu_color = Colors.RED if avg_cpu > 50 else Colors.BRIGHT_RED if avg_cpu > 20 else Colors.GREEN
-            print(f"  {Colors.RED}🖥️  CPU使用率:{Colors.RESET} {cpu_color}平均 {avg_cpu:.2f}%{Colors.RESET}, {Colors.RED}最大 {max_cpu:.2f}%{Colors.RESET}")
-            
-            # 内存使用统计
-            mem_color = Colors.BLUE if avg_memory_mb > 100 else Colors.BRIGHT_BLUE if avg_memory_mb > 50 else Colors.BLUE
-            print(f"  {Colors.BLUE}💾 内存使用量:{Colors.RESET} {mem_color}平均 {avg_memory_mb:.2f} MB{Colors.RESET}, {Colors.BLUE}最大 {max_memory_mb:.2f} MB{Colors.RESET}")
-            
-            # 内存使用百分比统计
-            mem_pct_color = Colors.GREEN if avg_memory_percent > 50 else Colors.BRIGHT_GREEN if avg_memory_percent > 20 else Colors.GREEN
-            print(f"  {Colors.GREEN}📈 内存使用率:{Colors.RESET} {mem_pct_color}平均 {avg_memory_percent:.2f}%{Colors.RESET}, {Colors.GREEN}最大 {max_memory_percent:.2f}%{Colors.RESET}")
+            duration = target_data.duration()
+            first = target_data[0]
+            
+            # 颜色阈值与实时表格一致
+            lines.append(SUMMARY_TARGET_TEMPLATE.format(
+                target=target, pid=first['pid'], command=first['command'],
+                duration=duration, samples=len(target_data),
+                cpu_color=bin_color(avg_cpu, CPU_COLOR_BINS), avg_cpu=avg_cpu, max_cpu=max_cpu,
+                mem_color=bin_color(avg_memory_mb, MEM_MB_COLOR_BINS),
+                avg_memory_mb=avg_memory_mb, max_memory_mb=max_memory_mb,
+                mem_pct_color=bin_color(avg_memory_percent, MEM_PERCENT_COLOR_BINS),
+                avg_memory_percent=avg_memory_percent, max_memory_percent=max_memory_percent,
+            ))
         
+        # One write for all targets
+        if lines:
+            print_lines(lines)
         print_separator(100, "=")
     
     def generate_performance_report(self, data_file=None, command_params=None):
@@ -1575,9 +2214,15 @@ class ProcessMonitor:
             if not data_file:
                 # Find the most recent data file in report directory
                 if self.report_dir:
-                    data_files = glob.glob(os.path.join(self.report_dir, "monitor_data_*.json"))
-                    if data_files:
-                        data_file = max(data_files, key=os.path.getctime)
+                    # One directory pass; each DirEntry caches its own stat result
+                    latest = None
+                    if os.path.isdir(self.report_dir):
+                        with os.scandir(self.report_dir) as entries:
+                            latest = max((entry for entry in entries
+                                          if entry.name.startswith('monitor_data_') and entry.name.endswith('.json')),
+                                         key=lambda entry: entry.stat().st_ctime, default=None)
+                    if latest is not None:
+                        data_file = latest.path
                     else:
                         logger.warning("No data files found in report directory")
                         return False
@@ -1645,6 +2290,7 @@ def main():
     parser.add_argument('--enable-thread-count', action='store_true', help='Enable thread count monitoring')
     parser.add_argument('--disable-cpu', action='store_true', help='Disable CPU monitoring')
     parser.add_argument('--disable-memory', action='store_true', help='Disable memory monitoring')
+    parser.add_argument('--monitor-cpu', type=int, help='CPU to pin the monitor thread to (Linux, default: last available CPU, -1 to disable)')
     
     args = parser.parse_args()
     
@@ -1706,12 +2352,11 @@ def main():
                         args.max_ticks
                     )
         elif args.monitor:
-            monitor.start_monitoring(args.interval, args.duration)
+            monitor.start_monitoring(args.interval, args.duration, args.monitor_cpu)
             logger.info("Monitoring started, press Ctrl+C to stop")
             
             try:
-                while monitor.monitoring:
-                    time.sleep(1)
+                monitor.wait_until_stopped()
             except KeyboardInterrupt:
                 logger.info("Received interrupt signal")
             